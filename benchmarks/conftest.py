@@ -0,0 +1,98 @@
+"""
+Benchmarks for dppd verbs (pytest-benchmark).
+
+Run with ``pytest benchmarks`` (they are not part of the 'tests' testpath).
+Every benchmark times the dppd pipeline and, via ``compare``, the
+equivalent raw pandas code - the ratio is stored in the benchmark's
+extra_info and summarized at the end of the run.
+"""
+
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+ratios = []
+
+
+def _frame(rows, groups, wide_columns=0, seed=500):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    s1 = letters[rng.integers(0, 26, rows)]
+    s2 = letters[rng.integers(0, 26, rows)]
+    df = pd.DataFrame(
+        {
+            "key": rng.integers(0, groups, rows),
+            "a": rng.normal(size=rows),
+            "b": rng.normal(size=rows),
+            "s1": s1,
+            "s2": s2,
+            "s": np.char.add(np.char.add(s1, "."), s2),
+        }
+    )
+    if wide_columns:
+        extra = pd.DataFrame(
+            rng.normal(size=(rows, wide_columns)),
+            columns=["c%i" % ii for ii in range(wide_columns)],
+        )
+        df = pd.concat([df, extra], axis=1)
+    return df
+
+
+@pytest.fixture(scope="session")
+def tall():
+    """50k rows, 10 groups"""
+    return _frame(50_000, 10)
+
+
+@pytest.fixture(scope="session")
+def wide():
+    """1k rows, 500 extra float columns, 10 groups"""
+    return _frame(1_000, 10, wide_columns=500)
+
+
+@pytest.fixture(scope="session")
+def many_groups():
+    """50k rows, 5k groups"""
+    return _frame(50_000, 5_000)
+
+
+@pytest.fixture(params=["tall", "wide", "many_groups"])
+def shape(request):
+    return request.param, request.getfixturevalue(request.param)
+
+
+@pytest.fixture
+def compare(benchmark, request):
+    """benchmark dppd_func and relate it to the best time of pandas_func"""
+
+    def compare(dppd_func, pandas_func):
+        result = benchmark(dppd_func)
+        if benchmark.disabled or benchmark.stats is None:
+            return result
+        rounds = max(3, min(benchmark.stats.stats.rounds, 20))
+        pandas_time = min(timeit.repeat(pandas_func, number=1, repeat=rounds))
+        dppd_time = benchmark.stats.stats.min
+        benchmark.extra_info["pandas_min"] = pandas_time
+        benchmark.extra_info["dppd_pandas_ratio"] = dppd_time / pandas_time
+        ratios.append((request.node.name, dppd_time, pandas_time))
+        return result
+
+    return compare
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not ratios:
+        return
+    terminalreporter.section("dppd / pandas")
+    width = max(len(name) for (name, _, _) in ratios)
+    for name, dppd_time, pandas_time in ratios:
+        terminalreporter.write_line(
+            f"{name:<{width}}  dppd {dppd_time * 1000:10.3f} ms"
+            f"  pandas {pandas_time * 1000:10.3f} ms"
+            f"  ratio {dppd_time / pandas_time:7.2f}"
+        )
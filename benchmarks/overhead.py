@@ -0,0 +1,118 @@
+"""Per-call overhead of dppd's proxy/dispatch layer for pandas-forwarded verbs.
+
+Times ``dp(df).<verb>()`` against ``df.<verb>()`` for every DataFrame method
+forwarded by register_type_methods_as_verbs (and not replaced by a dppd verb)
+that can be called without arguments on a small frame.
+
+Run ``python benchmarks/overhead.py [rows]`` for a table,
+benchmarks/test_bench_overhead.py guards against regressions.
+"""
+
+import os
+import sys
+import timeit
+import warnings
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from dppd import dppd  # noqa:E402
+from dppd.base import forwarded_verbs, register_pending_type_methods, Dppd  # noqa:E402
+
+# plotting, printing, clipboard/file writing, in place modification
+excluded = {
+    "boxplot",
+    "hist",
+    "info",
+    "insert",
+    "plot",
+    "pop",
+    "to_clipboard",
+    "to_excel",
+    "to_hdf",
+    "to_pickle",
+    "to_sql",
+    "to_stata",
+    "update",
+}
+
+
+def small_frame(rows=100, seed=500):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "a": rng.normal(size=rows),
+            "b": rng.normal(size=rows),
+            "c": rng.integers(0, 10, rows),
+            "d": rng.integers(0, 1000, rows),
+        }
+    )
+
+
+def callable_verbs(df):
+    """Sorted names of forwarded verbs that df.<verb>() accepts"""
+    register_pending_type_methods(pd.DataFrame)
+    result = []
+    for name in sorted(forwarded_verbs[pd.DataFrame] - excluded):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                getattr(df.copy(), name)()
+        except Exception:
+            continue
+        result.append(name)
+    return result
+
+
+def _unproxy(result):
+    # results that are not dppd types drop out of the pipe on their own
+    return result.pd if isinstance(result, Dppd) else result
+
+
+def measure_overhead(df, verbs=None, number=20, repeat=7):
+    """DataFrame of best-of-repeat seconds per call (dppd, pandas, overhead)"""
+    dp, X = dppd()
+    if verbs is None:
+        verbs = callable_verbs(df)
+    rows = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name in verbs:
+            dppd_times = []
+            pandas_times = []
+            # interleaved, so that both see the same machine state
+            for _ in range(repeat):
+                dppd_times.append(
+                    timeit.timeit(
+                        lambda: _unproxy(getattr(dp(df), name)()), number=number
+                    )
+                )
+                pandas_times.append(
+                    timeit.timeit(lambda: getattr(df, name)(), number=number)
+                )
+            rows.append((name, min(dppd_times) / number, min(pandas_times) / number))
+    result = pd.DataFrame(rows, columns=["verb", "dppd", "pandas"])
+    result = result.assign(overhead=result["dppd"] - result["pandas"])
+    return result.sort_values("overhead", ascending=False).reset_index(drop=True)
+
+
+def format_table(result):
+    lines = [
+        f"{'verb':<24} {'dppd us':>10} {'pandas us':>10} {'overhead us':>12}",
+    ]
+    for row in result.itertuples():
+        lines.append(
+            f"{row.verb:<24} {row.dppd * 1e6:10.1f} {row.pandas * 1e6:10.1f}"
+            f" {row.overhead * 1e6:12.1f}"
+        )
+    lines.append(
+        f"median overhead {result['overhead'].median() * 1e6:.1f} us"
+        f" over {len(result)} verbs"
+    )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(format_table(measure_overhead(small_frame(rows))))
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import pytest
+
+src = os.path.join(os.path.dirname(__file__), "..", "src")
+# 'import dppd' on top of an already imported pandas, in milliseconds
+budget = float(os.environ.get("DPPD_IMPORT_BUDGET_MS", 20))
+
+
+@pytest.fixture(scope="module")
+def pycache(tmp_path_factory):
+    """A bytecode cache, so that we don't time compiling dppd"""
+    return str(tmp_path_factory.mktemp("pycache"))
+
+
+def import_time(pycache, statement="import dppd", preload="import pandas"):
+    """Seconds spent in statement in a fresh interpreter, after preload"""
+    code = (
+        f"{preload}\n"
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([src, os.environ.get("PYTHONPATH", "")]),
+        PYTHONPYCACHEPREFIX=pycache,
+    )
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    p = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(p.stdout.strip().split("\n")[-1])
+
+
+def bench_import(benchmark, pycache, *args):
+    import_time(pycache, *args)  # warm the bytecode cache
+    times = []
+    benchmark.pedantic(lambda: times.append(import_time(pycache, *args)), rounds=7)
+    benchmark.extra_info["import_seconds"] = min(times)
+    return min(times)
+
+
+def test_import_dppd(benchmark, pycache):
+    """import dppd on top of an already imported pandas"""
+    assert bench_import(benchmark, pycache) * 1000 < budget
+
+
+def test_cold_start(benchmark, pycache):
+    """import dppd (and pandas) in a fresh interpreter"""
+    bench_import(benchmark, pycache, "import dppd", "")
+
+
+def test_import_dppd_without_heavy_dependencies(pycache):
+    code = (
+        "import sys\n"
+        "import dppd\n"
+        "heavy = ['scipy', 'sklearn', 'natsort']\n"
+        "assert not [m for m in heavy if m in sys.modules]"
+    )
+    import_time(pycache, code, "import pandas")
+
+
+def test_import_dppd_and_first_forwarded_verb(benchmark, pycache):
+    bench_import(
+        benchmark,
+        pycache,
+        "import dppd\ndp, X = dppd.dppd()\ndp(df).head().pd",
+        "import pandas\ndf = pandas.DataFrame({'a': [1]})",
+    )
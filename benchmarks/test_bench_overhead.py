@@ -0,0 +1,32 @@
+import os
+import pandas as pd
+from dppd import dppd
+from overhead import small_frame, callable_verbs, measure_overhead, format_table
+
+dp, X = dppd()
+
+# median per-call overhead of dp(df).verb() over df.verb() on a 100 row frame,
+# in microseconds.
+budget = float(os.environ.get("DPPD_OVERHEAD_BUDGET_US", 50))
+
+
+def test_forwarded_verbs_are_covered():
+    verbs = callable_verbs(small_frame())
+    assert "head" in verbs
+    assert "sum" in verbs
+    assert "select" not in verbs  # dppd's own verb
+    assert len(verbs) > 50
+
+
+def test_forwarded_verb_overhead(capsys):
+    result = measure_overhead(small_frame())
+    with capsys.disabled():
+        print()
+        print(format_table(result))
+    assert result["overhead"].median() * 1e6 < budget
+
+
+def test_dispatch_overhead(benchmark):
+    df = small_frame()
+    result = benchmark(lambda: dp(df).head().pd)
+    pd.testing.assert_frame_equal(result, df.head())
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import pytest
+from dppd import dppd
+from dppd.column_spec import parse_column_specification
+
+dp, X = dppd()
+
+
+def test_select(compare, shape):
+    _, df = shape
+    columns = list(df.columns[1::2])
+    compare(lambda: dp(df).select(columns).pd, lambda: df[columns])
+
+
+def test_select_drop(compare, shape):
+    _, df = shape
+    compare(lambda: dp(df).select("-a").pd, lambda: df.drop(columns=["a"]))
+
+
+def test_mutate(compare, shape):
+    _, df = shape
+    compare(
+        lambda: dp(df).mutate(c=df["a"] + df["b"]).pd,
+        lambda: df.assign(c=df["a"] + df["b"]),
+    )
+
+
+def test_grouped_mutate_series(compare, shape):
+    _, df = shape
+    compare(
+        lambda: dp(df).groupby("key").mutate(c=df["a"] * 2).ungroup().pd,
+        lambda: df.assign(c=df["a"] * 2),
+    )
+
+
+def test_grouped_mutate_callable(compare, shape):
+    _, df = shape
+    compare(
+        lambda: dp(df)
+        .groupby("key")
+        .mutate(c=lambda sub_df: sub_df["a"] - sub_df["a"].mean())
+        .ungroup()
+        .pd,
+        lambda: df.assign(c=df["a"] - df.groupby("key")["a"].transform("mean")),
+    )
+
+
+def test_filter_by(compare, shape):
+    _, df = shape
+    compare(lambda: dp(df).filter_by(df["a"] > 0).pd, lambda: df[df["a"] > 0])
+
+
+def test_summarize(compare, shape):
+    _, df = shape
+    compare(
+        lambda: dp(df).groupby("key").summarize(("a", np.mean, "a_mean")).pd,
+        lambda: df.groupby("key", as_index=False).agg(a_mean=("a", "mean")),
+    )
+
+
+def test_do(compare, shape):
+    _, df = shape
+    compare(
+        lambda: dp(df).groupby("key").do(lambda sub_df: sub_df.head(1)).pd,
+        lambda: df.groupby("key").head(1),
+    )
+
+
+@pytest.fixture(scope="module")
+def tidy(tall):
+    return (
+        tall.assign(id=np.arange(len(tall)) // 10, var=np.arange(len(tall)) % 10)
+        .loc[:, ["id", "var", "a"]]
+        .rename(columns={"a": "value"})
+    )
+
+
+def test_spread(compare, tidy):
+    compare(
+        lambda: dp(tidy).spread("var", "value").pd,
+        lambda: tidy.pivot(index="id", columns="var", values="value").reset_index(),
+    )
+
+
+def test_gather(compare, shape):
+    _, df = shape
+    value_columns = [x for x in df.columns if x not in ("key", "s1", "s2", "s")]
+    compare(
+        lambda: dp(df).gather("variable", "value", value_columns).pd,
+        lambda: pd.melt(
+            df, [x for x in df.columns if x not in value_columns], value_columns
+        ),
+    )
+
+
+def test_unite(compare, tall):
+    compare(
+        lambda: dp(tall).unite(["s1", "s2"], ".").pd,
+        lambda: tall["s1"] + "." + tall["s2"],
+    )
+
+
+def test_seperate(compare, tall):
+    compare(
+        lambda: dp(tall).seperate("s", ["A", "B"]).pd,
+        lambda: pd.concat(
+            [tall, tall["s"].str.split(".", expand=True).set_axis(["A", "B"], axis=1)],
+            axis=1,
+        ),
+    )
+
+
+def test_categorize(compare, shape):
+    _, df = shape
+    compare(
+        lambda: dp(df).categorize(["s1", "s2"]).pd,
+        lambda: df.astype({"s1": "category", "s2": "category"}),
+    )
+
+
+def test_binarize(compare, shape):
+    _, df = shape
+    df = df.astype({"s1": "category"})
+    compare(
+        lambda: dp(df).binarize("s1").pd,
+        lambda: pd.concat(
+            [df.drop(columns=["s1"]), pd.get_dummies(df["s1"], prefix="s1_")], axis=1
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "spec, pandas_func",
+    [
+        ("a", lambda df: ["a"]),
+        (["c1", "a", "b"], lambda df: [x for x in ["c1", "a", "b"] if x in df.columns]),
+        (("^c1",), lambda df: list(df.columns[df.columns.str.contains("^c1")])),
+        ("-a", lambda df: [x for x in df.columns if x != "a"]),
+        (np.number, lambda df: list(df.select_dtypes(np.number).columns)),
+    ],
+    ids=["str", "list", "regexp", "drop", "dtype"],
+)
+def test_parse_column_specification(compare, wide, spec, pandas_func):
+    compare(
+        lambda: parse_column_specification(wide, spec, return_list=True),
+        lambda: pandas_func(wide),
+    )
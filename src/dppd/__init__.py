@@ -1,9 +1,30 @@
 # -*- coding: utf-8 -*-
 
-from .base import dppd, register_verb, register_type_methods_as_verbs
+from .base import (
+    dppd,
+    register_verb,
+    register_type_methods_as_verbs,
+    options,
+    option_context,
+)
 from . import single_verbs  # noqa:F401
 from . import non_df_verbs  # noqa:F401
+from . import io_verbs  # noqa:F401
+from .profiling import profile_verbs, trace_verbs, profile_from_environment
+from .memo import memoize_verbs
 
 __version__ = "0.31"
 
-__all_ = [dppd, register_verb, register_type_methods_as_verbs, __version__]
+profile_from_environment()
+
+__all_ = [
+    dppd,
+    register_verb,
+    register_type_methods_as_verbs,
+    options,
+    option_context,
+    profile_verbs,
+    trace_verbs,
+    memoize_verbs,
+    __version__,
+]
@@ -5,6 +5,103 @@ import wrapt
 verb_registry = {}
 property_registry = {}
 dppd_types = set([None])  # which types are handled by dppd, others drop out of the pipe
+# type -> names of methods forwarded by register_type_methods_as_verbs
+# (and not replaced by a dppd verb since). Filled lazily, see register_pending_type_methods
+forwarded_verbs = {}
+# type -> excluded names, for types whose methods have not all been registered yet
+pending_type_methods = {}
+# callables wrapped around every verb call, see dppd.profiling.
+# Called as observer(verb_name, obj, call, args, kwargs) and must return call(*args, **kwargs)
+verb_call_observers = []
+# (verb name, type) of verbs registered with pure=True - see dppd.memo
+pure_verbs = set()
+
+
+# type -> function turning an instance into a DataFrame, for sources that defer
+# reading (see dppd.io_verbs). Anything but their own verbs materializes them.
+deferred_types = {}
+
+# global settings, change them with option_context
+# arrow: convert object columns of DataFrames passed to dp() to pyarrow backed dtypes,
+# and have verbs creating string columns emit pyarrow backed ones
+options = {"arrow": False}
+
+
+class option_context:
+    """Context manager temporarily setting dppd options
+
+    Usage::
+
+        with option_context(arrow=True):
+            dp(df).unite(...).pd
+
+    """
+
+    def __init__(self, **kwargs):
+        unknown = set(kwargs).difference(options)
+        if unknown:
+            raise KeyError(f"Unknown dppd options: {sorted(unknown)}")
+        self.kwargs = kwargs
+
+    def __enter__(self):
+        self.previous = {k: options[k] for k in self.kwargs}
+        options.update(self.kwargs)
+        return options
+
+    def __exit__(self, _type, _value, _traceback):
+        options.update(self.previous)
+
+
+def convert_to_arrow(df):
+    """Convert the object columns of a DataFrame to pyarrow backed dtypes
+    (string[pyarrow], bool[pyarrow]...) where possible. Other columns are not copied
+    """
+    positions = [ii for (ii, dtype) in enumerate(df.dtypes) if dtype == object]
+    if not positions:
+        return df
+    converted = df.iloc[:, positions].convert_dtypes(dtype_backend="pyarrow")
+    result = df.copy(deep=False)
+    for ii, pos in enumerate(positions):
+        result.isetitem(pos, converted.iloc[:, ii])
+    return result
+
+
+def observe_verb_call(observers, name, obj, call, args, kwargs):
+    """Run call(*args, **kwargs) wrapped in observers (first one outermost)"""
+    if not observers:
+        return call(*args, **kwargs)
+    return observers[0](
+        name,
+        obj,
+        lambda *args, **kwargs: observe_verb_call(
+            observers[1:], name, obj, call, args, kwargs
+        ),
+        args,
+        kwargs,
+    )
+
+
+def observe_groups(name, groups):
+    """Wrap an iterator of (group_key, sub_df) so that observers
+    with group_begin/group_end methods see the processing of each group.
+
+    Returns groups unchanged if no such observer is installed.
+    """
+    observers = [x for x in verb_call_observers if hasattr(x, "group_begin")]
+    if not observers:
+        return groups
+    return _observed_groups(observers, name, groups)
+
+
+def _observed_groups(observers, name, groups):
+    for key, sub_df in groups:
+        for observer in observers:
+            observer.group_begin(name, key, sub_df)
+        try:
+            yield key, sub_df
+        finally:
+            for observer in reversed(observers):
+                observer.group_end(name, key, sub_df)
 
 
 class register_verb:
@@ -21,7 +118,14 @@ class register_verb:
 
     """
 
-    def __init__(self, name=None, types=None, pass_dppd=False, ignore_redefine=False):
+    def __init__(
+        self,
+        name=None,
+        types=None,
+        pass_dppd=False,
+        ignore_redefine=False,
+        pure=False,
+    ):
         """
         Parameters:
         -----------
@@ -33,6 +137,9 @@ class register_verb:
                 this verb only applies to these types
             pass_dppd:
                 this func will get dppd instead of dppd.df (e.g. for dir)
+            pure:
+                the result depends only on the DataFrame and the arguments,
+                and neither is modified - may be memoized, see dppd.memo
         """
         self.names = name
         if not isinstance(types, list):
@@ -44,6 +151,7 @@ class register_verb:
                 property_registry[t] = set()
         self.pass_dppd = pass_dppd
         self.ignore_redefine = ignore_redefine
+        self.pure = pure
 
     def __call__(self, func):
         if self.names is None:
@@ -55,11 +163,24 @@ class register_verb:
                 real_names = self.names
 
         def outer(dppd):
-            def inner(*args, **kwargs):
+            def call(*args, **kwargs):
                 if self.pass_dppd:
-                    result = func(dppd, *args, **kwargs)
+                    return func(dppd, *args, **kwargs)
                 else:
-                    result = func(dppd.df, *args, **kwargs)
+                    return func(dppd.df, *args, **kwargs)
+
+            def inner(*args, **kwargs):
+                if verb_call_observers:
+                    result = observe_verb_call(
+                        list(verb_call_observers),
+                        real_names[0],
+                        dppd.df,
+                        call,
+                        args,
+                        kwargs,
+                    )
+                else:
+                    result = call(*args, **kwargs)
                 # no verbs:
                 if type(result) in dppd_types:
                     return dppd._descend(result)
@@ -87,6 +208,12 @@ class register_verb:
             outer.__doc__ == func.__doc__
             for t in self.types:
                 verb_registry[real_name, t] = outer
+                if self.pure:
+                    pure_verbs.add((real_name, t))
+                else:
+                    pure_verbs.discard((real_name, t))
+                if t in forwarded_verbs:
+                    forwarded_verbs[t].discard(real_name)
         return func
 
 
@@ -103,23 +230,57 @@ def register_property(name, types=None):
         dppd_types.add(t)
 
 
+def register_deferred_type(cls, materialize):
+    """Register a deferred source type - materialize(obj) must return a DataFrame"""
+    deferred_types[cls] = materialize
+    property_registry.setdefault(cls, set())
+    dppd_types.add(cls)
+
+
 def register_type_methods_as_verbs(cls, excluded):
-    for df_method in dir(cls):
-        if df_method not in excluded:
-            if not df_method.startswith("_"):
-                try:
-                    attr = getattr(cls, df_method)
-                    if hasattr(attr, "__call__"):
-                        register_verb(df_method, types=cls)(attr)
-                    else:
-                        register_property(df_method, types=cls)
-                except AttributeError as e:  # pragma: no cover
-                    # this happens in pandas < 0.23 for DataFrame.columns
-                    if "'NoneType' object has no attribute '_data'" in str(e):
-                        register_property(df_method, types=cls)
-                    else:
-                        # just a defensive measure
-                        raise  # pragma: no cover
+    """Forward all public methods of cls (minus excluded) as verbs, and
+    all other public attributes as properties.
+
+    Registration happens lazily, on the first lookup of a name
+    (or on dir()), verbs registered with register_verb take precedence.
+    """
+    forwarded_verbs.setdefault(cls, set())
+    property_registry.setdefault(cls, set())
+    dppd_types.add(cls)
+    pending_type_methods[cls] = set(excluded)
+
+
+def _register_type_method(cls, name):
+    """Register cls.name if it's a pending forward. Returns True if something was registered"""
+    excluded = pending_type_methods.get(cls)
+    if excluded is None or name in excluded or name.startswith("_"):
+        return False
+    if (name, cls) in verb_registry or name in property_registry[cls]:
+        return False
+    try:
+        attr = getattr(cls, name)
+    except AttributeError:
+        return False
+    if hasattr(attr, "__call__"):
+        register_verb(name, types=cls)(attr)
+        forwarded_verbs[cls].add(name)
+    else:
+        register_property(name, types=cls)
+    return True
+
+
+def register_pending_type_methods(cls=None):
+    """Register all (pending) forwarded methods, of cls or of all types"""
+    if cls is None:
+        classes = list(pending_type_methods)
+    elif cls in pending_type_methods:
+        classes = [cls]
+    else:
+        classes = []
+    for c in classes:
+        for name in dir(c):
+            _register_type_method(c, name)
+        del pending_type_methods[c]
 
 
 class Dppd:
@@ -165,6 +326,8 @@ class Dppd:
     def pd(self):
         """Return the actual, unproxyied DataFrame"""
         result = self.df
+        if type(result) in deferred_types:
+            result = deferred_types[type(result)](result)
         if self.parent is not None:
             self._dppd_proxy._self_update_wrapped(self.parent)
             self.X._self_update_wrapped(self.parent.df)
@@ -183,9 +346,28 @@ class Dppd:
                 raise ValueError("You have to call dp(df) before calling dp()")
             return self
         else:
+            if options["arrow"] and isinstance(df, pd.DataFrame):
+                df = convert_to_arrow(df)
             last = self._dppd_proxy._get_wrapped()
             return self._descend(df, parent=last)
 
+    def read_parquet(self, path, **kwargs):
+        """Start a pipeline on a parquet file without reading it (yet).
+
+        select and filter_by are pushed into the reader, see
+        :class:`dppd.io_verbs.ParquetSource`, any other verb reads the file.
+        """
+        from .io_verbs import ParquetSource
+
+        return self(ParquetSource(path, **kwargs))
+
+    def read_arrow_mmap(self, path, **kwargs):
+        """Start a pipeline on an Arrow IPC (feather v2) file, memory mapped,
+        see :func:`dppd.io_verbs.read_arrow_mmap`"""
+        from .io_verbs import read_arrow_mmap
+
+        return self(read_arrow_mmap(path, **kwargs))
+
     def __getattr__(self, attr):
         if attr == "__qualname__":  # pragma: no cover
             raise AttributeError(
@@ -195,21 +377,29 @@ class Dppd:
             raise ValueError("Dppd not initialized with a DataFrame")
         if (attr, type(self.df)) in verb_registry:
             return verb_registry[attr, type(self.df)](self)
+        elif type(self.df) in deferred_types:
+            materialized = deferred_types[type(self.df)](self.df)
+            return getattr(self._descend(materialized), attr)
         elif (attr, None) in verb_registry:
             return verb_registry[attr, None](self)
         elif attr in property_registry[type(self.df)]:
             return GetItemProxy(getattr(self.df, attr), self)
         # if attr in property_registry[None]:
         # return GetItemProxy(getattr(self.df, attr), self)
+        elif _register_type_method(type(self.df), attr):
+            return self.__getattr__(attr)
         else:
             raise AttributeError(attr, type(self.df))
 
     def __getitem__(self, slice):
+        if type(self.df) in deferred_types:
+            return self._descend(deferred_types[type(self.df)](self.df))[slice]
         return self._descend(self.df[slice])
 
     def __dir__(self):
         result = set()
         my_typ = type(self.df)
+        register_pending_type_methods(my_typ)
         for name, typ in verb_registry.keys():
             if typ is None or typ is my_typ:
                 result.add(name)
@@ -311,6 +501,8 @@ class dppd:
     """
 
     def __init__(self, df=None):
+        if options["arrow"] and isinstance(df, pd.DataFrame):
+            df = convert_to_arrow(df)
         self.df = df
         # So that dp() is always the lastes
         self.__dppd_proxy = ReplacableProxy(None)
@@ -0,0 +1,591 @@
+"""Deferred and memory mapped file sources.
+
+``dp.read_parquet(path)`` returns a :class:`ParquetSource` instead of a
+DataFrame. The select and filter_by verbs on it only narrow down what will be
+read - columns= and filters= of pyarrow.parquet.read_table, which skips
+row groups by their statistics. The file is read by the first other verb
+(or .pd)::
+
+    dp.read_parquet('big.parquet').select(['name', 'hp']).filter_by(X.hp > 100).arrange('hp').pd
+
+``to_feather_mmap(path)`` checkpoints a pipeline into an uncompressed Arrow IPC
+file and continues on a memory mapped view of it, ``dp.read_arrow_mmap(path)``
+picks it up again later::
+
+    dp(df).groupby('x').do(expensive).to_feather_mmap('stage1.arrow').select(...).pd
+
+``cache(func)`` keeps the result of an expensive stage on disk, keyed by the
+input frame and the stage::
+
+    dp(df).cache(lambda df: dp(df).groupby('x').do(expensive).pd).select(...).pd
+
+"""
+
+import dis
+import functools
+import hashlib
+import os
+import types
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .base import register_verb, register_deferred_type, options, ReplacableProxy
+from .column_spec import parse_column_specification
+from .lazy import lazy_module
+from .single_verbs import filter_by
+
+pa = lazy_module("pyarrow")
+pq = lazy_module("pyarrow.parquet")
+pa_dataset = lazy_module("pyarrow.dataset")
+ipc = lazy_module("pyarrow.ipc")
+
+
+class ParquetFilter:
+    """A conjunction of (column, op, value) tuples, in pyarrow's filters format.
+
+    Created by comparing X.column on a ParquetSource, combine with &.
+    """
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+
+    def __and__(self, other):
+        other = _filter_terms(other)
+        if other is None:
+            return NotImplemented
+        return ParquetFilter(self.terms + other)
+
+    def __bool__(self):
+        raise ValueError("Combine parquet filters with &, not 'and'")
+
+    def __repr__(self):
+        return f"ParquetFilter({self.terms!r})"
+
+
+class ParquetColumn:
+    """A column of a ParquetSource (X.column) - comparisons return ParquetFilters"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _term(self, op, value):
+        return ParquetFilter([(self.name, op, value)])
+
+    def __eq__(self, value):
+        return self._term("==", value)
+
+    def __ne__(self, value):
+        return self._term("!=", value)
+
+    def __lt__(self, value):
+        return self._term("<", value)
+
+    def __le__(self, value):
+        return self._term("<=", value)
+
+    def __gt__(self, value):
+        return self._term(">", value)
+
+    def __ge__(self, value):
+        return self._term(">=", value)
+
+    def isin(self, values):
+        return self._term("in", list(values))
+
+    def __repr__(self):
+        return f"ParquetColumn({self.name!r})"
+
+
+def _filter_terms(filter_arg):
+    """ParquetFilter / (column, op, value) tuple / list of those -> list of tuples,
+    or None if filter_arg can't be pushed into the reader"""
+    if isinstance(filter_arg, ParquetFilter):
+        return list(filter_arg.terms)
+    elif (
+        isinstance(filter_arg, tuple)
+        and len(filter_arg) == 3
+        and isinstance(filter_arg[0], str)
+    ):
+        return [filter_arg]
+    elif isinstance(filter_arg, list) and filter_arg:
+        result = []
+        for x in filter_arg:
+            terms = _filter_terms(x)
+            if terms is None:
+                return None
+            result.extend(terms)
+        return result
+    return None
+
+
+def _column_names(column_spec):
+    if isinstance(column_spec, ParquetColumn):
+        return column_spec.name
+    elif isinstance(column_spec, list):
+        return [_column_names(x) for x in column_spec]
+    return column_spec
+
+
+class ParquetSource:
+    """A parquet file that has not been read yet.
+
+    Parameters
+    ----------
+        path : str or Path
+        columns : list or None
+            columns to read - None: all
+        filters : list or None
+            list of (column, op, value) tuples (logical and), see pyarrow.parquet.read_table
+        **read_kwargs :
+            passed on to pyarrow.parquet.read_table
+
+    The stored index is kept - filtered rows of a file with a RangeIndex
+    keep their labels (they are read row group by row group then).
+    """
+
+    def __init__(self, path, columns=None, filters=None, **read_kwargs):
+        self.path = path
+        self.columns = columns
+        self.filters = filters
+        self.read_kwargs = read_kwargs
+        self._schema = None
+
+    @property
+    def schema(self):
+        """The pyarrow schema of the file (read from the footer only)"""
+        if self._schema is None:
+            self._schema = pq.read_schema(self.path)
+        return self._schema
+
+    def schema_frame(self):
+        """An empty DataFrame with the (selected) columns and their dtypes,
+        to resolve column specifications against"""
+        df = self.schema.empty_table().to_pandas()
+        if self.columns is not None:
+            df = df[self.columns]
+        return df
+
+    def derive(self, **kwargs):
+        """A copy with some parameters replaced"""
+        params = {"columns": self.columns, "filters": self.filters}
+        params.update(kwargs)
+        result = ParquetSource(self.path, **params, **self.read_kwargs)
+        result._schema = self._schema
+        return result
+
+    def _range_index(self):
+        """The stored RangeIndex (dict of name, start, stop, step) or None"""
+        metadata = self.schema.pandas_metadata or {}
+        for x in metadata.get("index_columns", []):
+            if isinstance(x, dict) and x.get("kind") == "range":
+                return x
+        return None
+
+    def _read_filtered_rows(self):
+        """Read the filtered rows row group by row group (still pruned by their
+        statistics) - returns the table and the row numbers of the kept rows"""
+        expression = pq.filters_to_expression(self.filters)
+        columns = list(self.schema.names if self.columns is None else self.columns)
+        # flat (column, op, value) terms or pyarrow's lists of them
+        filter_columns = {
+            term[0]
+            for x in self.filters
+            for term in (x if isinstance(x, list) else [x])
+        }
+        read_columns = columns + sorted(filter_columns - set(columns))
+        metadata = pq.read_metadata(self.path)
+        offsets = np.cumsum(
+            [0]
+            + [metadata.row_group(ii).num_rows for ii in range(metadata.num_row_groups)]
+        )
+        fragment = next(
+            iter(pa_dataset.dataset(self.path, format="parquet").get_fragments())
+        )
+        tables = []
+        rows = []
+        for part in fragment.split_by_row_group(expression):
+            (row_group,) = part.row_groups
+            table = part.to_table(columns=read_columns)
+            start = offsets[row_group.id]
+            table = table.append_column(
+                "__dppd_row__", pa.array(np.arange(start, start + len(table)))
+            ).filter(expression)
+            rows.append(table.column("__dppd_row__").to_numpy())
+            tables.append(table.select(columns))
+        if not tables:
+            return self.schema.empty_table().select(columns), np.zeros(0, np.int64)
+        return pa.concat_tables(tables), np.concatenate(rows)
+
+    def read(self):
+        """Read the (selected, filtered) DataFrame - with its stored index"""
+        types_mapper = pd.ArrowDtype if options["arrow"] else None
+        range_index = self._range_index()
+        if self.filters and range_index is not None and os.path.isfile(self.path):
+            # pyarrow renumbers the filtered rows - keep their stored labels
+            table, rows = self._read_filtered_rows()
+            df = table.to_pandas(types_mapper=types_mapper)
+            df.index = pd.Index(
+                range_index["start"] + range_index["step"] * rows,
+                name=range_index["name"],
+            )
+            return df
+        read_kwargs = {"use_pandas_metadata": True}
+        read_kwargs.update(self.read_kwargs)
+        table = pq.read_table(
+            self.path,
+            columns=self.columns,
+            filters=self.filters if self.filters else None,
+            **read_kwargs,
+        )
+        return table.to_pandas(types_mapper=types_mapper)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr not in self.schema.names:
+            raise AttributeError(attr)
+        return ParquetColumn(attr)
+
+    def __getitem__(self, column):
+        if column not in self.schema.names:
+            raise KeyError(column)
+        return ParquetColumn(column)
+
+    def __repr__(self):
+        return (
+            f"ParquetSource({str(self.path)!r}, columns={self.columns!r}, "
+            f"filters={self.filters!r})"
+        )
+
+
+register_deferred_type(ParquetSource, ParquetSource.read)
+
+
+@register_verb("select", types=ParquetSource)
+def select_ParquetSource(source, columns):
+    """Verb: Restrict the columns read from a parquet file.
+
+    The column specification (see :func:`dppd.single_verbs.parse_column_specification`)
+    is resolved against the file's schema, without reading any data.
+    """
+    columns = parse_column_specification(
+        source.schema_frame(), _column_names(columns), return_list=True
+    )
+    return source.derive(columns=list(columns))
+
+
+@register_verb("filter_by", types=ParquetSource)
+def filter_by_ParquetSource(source, filter_arg):
+    """Verb: Filter the rows read from a parquet file.
+
+    (column, op, value) tuples (or lists of them) and comparisons of
+    X.column (``X.hp > 100``, ``X.cyl.isin([4, 6])``, combined with &)
+    are passed to the reader as filters=, anything else reads the file
+    and filters the DataFrame (see :func:`dppd.single_verbs.filter_by`).
+    """
+    terms = _filter_terms(filter_arg)
+    if terms is None:
+        return filter_by(source.read(), filter_arg)
+    return source.derive(filters=(source.filters or []) + terms)
+
+
+def read_arrow_mmap(path, columns=None, arrow=None):
+    """Read an Arrow IPC (feather v2) file via a memory map.
+
+    The record batches stay in the page cache instead of being copied onto
+    the heap. With arrow (default: dppd.options['arrow']) every column is
+    a pd.ArrowDtype over the mapped buffers. Otherwise numeric columns
+    without missing values are numpy views into the map, the others
+    (strings, nullable columns) are converted.
+
+    Compressed files can not be mapped zero-copy - write them with
+    :func:`to_feather_mmap` (or feather.write_feather(compression='uncompressed')).
+
+    Parameters
+    ----------
+        path : str or Path
+        columns : list or None
+            columns to read - None: all
+        arrow : bool or None
+            return pyarrow backed columns
+    """
+    if arrow is None:
+        arrow = options["arrow"]
+    source = pa.memory_map(str(path), "r")
+    table = ipc.open_file(source).read_all()
+    if columns is not None:
+        # keep the stored index
+        metadata = table.schema.pandas_metadata or {}
+        index_columns = [
+            x for x in metadata.get("index_columns", []) if isinstance(x, str)
+        ]
+        table = table.select(list(columns) + index_columns)
+    return table.to_pandas(
+        types_mapper=pd.ArrowDtype if arrow else None,
+        split_blocks=True,
+    )
+
+
+@register_verb("to_feather_mmap", types=pd.DataFrame)
+def to_feather_mmap(df, path, arrow=None):
+    """Verb: Write df to an uncompressed Arrow IPC (feather v2) file and
+    continue on the memory mapped file (see :func:`read_arrow_mmap`).
+
+    Use as a checkpoint between pipeline stages - once the input frame is
+    dropped, the data lives in the (evictable) page cache only.
+    The index is stored along (RangeIndexes as metadata).
+
+    Example::
+
+        dp(df).groupby('x').do(expensive).to_feather_mmap('stage1.arrow').select(...).pd
+    """
+    table = pa.Table.from_pandas(df)
+    # never truncate a file that frames of an earlier run may still map
+    # (reading their pages would SIGBUS) - write aside, then swap it in
+    path = Path(path)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(tmp), "wb") as op:
+            with ipc.new_file(op, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return read_arrow_mmap(path, arrow=arrow)
+
+
+def _frame_fingerprint(df, fingerprint):
+    """Digest of a DataFrame - 'hash': all values (pd.util.hash_pandas_object),
+    'schema': columns, dtypes, shape and about 1000 evenly spaced rows"""
+    h = hashlib.sha256()
+    h.update(repr((list(df.columns), [str(x) for x in df.dtypes], df.shape)).encode())
+    if fingerprint == "hash":
+        sample = df
+    elif fingerprint == "schema":
+        sample = df.iloc[:: max(1, len(df) // 1000)]
+    else:
+        raise ValueError(f"fingerprint must be 'hash' or 'schema', was {fingerprint!r}")
+    h.update(pd.util.hash_pandas_object(sample, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def _update_code_fingerprint(h, code):
+    """Feed bytecode, referenced names and constants into the digest h,
+    recursing into nested functions (whose reprs contain their address)"""
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            h.update(b"code(")
+            _update_code_fingerprint(h, const)
+            h.update(b")")
+        else:
+            h.update(f"{type(const).__name__}:{const!r};".encode())
+
+
+def _global_names(code):
+    """Names code (and the functions nested in it) reads from the module globals"""
+    names = {
+        ins.argval
+        for ins in dis.get_instructions(code)
+        if ins.opname in ("LOAD_GLOBAL", "LOAD_NAME")
+    }
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_global_names(const))
+    return names
+
+
+def _update_referenced_fingerprint(h, value, module, seen):
+    """Feed a value a stage reads (global or closure cell) into the digest h.
+
+    Modules, classes and functions of other modules by name, the dp/X proxies
+    by type (they stand for whatever frame the stage is called on),
+    anything else like an argument"""
+    if isinstance(value, ReplacableProxy):
+        h.update(f"proxy:{type(value).__name__};".encode())
+    elif isinstance(value, types.ModuleType):
+        h.update(f"module:{value.__name__};".encode())
+    elif isinstance(value, type) or (
+        callable(value)
+        and getattr(value, "__module__", module) != module
+        and hasattr(value, "__qualname__")
+    ):
+        h.update(f"{value.__module__}.{value.__qualname__};".encode())
+    else:
+        _update_argument_fingerprint(h, value, seen)
+
+
+def _stage_fingerprint(func, _seen=None):
+    """A callable's module, name, bytecode and constants plus the values it
+    depends on - closure cells, defaults and the module globals it reads.
+
+    Stable across redefinitions and processes, changes when the code or one of
+    those values is changed. Raise TypeError if one of them can't be fingerprinted.
+    """
+    seen = set() if _seen is None else _seen
+    h = hashlib.sha256()
+    h.update(
+        f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', '')}".encode()
+    )
+    if isinstance(func, functools.partial):
+        h.update(_stage_fingerprint(func.func, seen).encode())
+        _update_argument_fingerprint(h, (func.args, func.keywords), seen)
+    elif isinstance(func, types.MethodType):
+        h.update(_stage_fingerprint(func.__func__, seen).encode())
+        _update_argument_fingerprint(h, func.__self__, seen)
+    elif isinstance(func, types.FunctionType):
+        if id(func) in seen:  # recursion - name and module suffice
+            return h.hexdigest()
+        seen.add(id(func))
+        _update_code_fingerprint(h, func.__code__)
+        _update_argument_fingerprint(h, (func.__defaults__, func.__kwdefaults__), seen)
+        for cell in func.__closure__ or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:  # not assigned yet
+                h.update(b"empty cell;")
+                continue
+            _update_referenced_fingerprint(h, value, func.__module__, seen)
+        for name in sorted(_global_names(func.__code__)):
+            if name in func.__globals__:
+                h.update(f"{name}=".encode())
+                _update_referenced_fingerprint(
+                    h, func.__globals__[name], func.__module__, seen
+                )
+    elif not isinstance(func, (types.BuiltinFunctionType, np.ufunc, type)):
+        raise TypeError(
+            f"cache: can't fingerprint callable of type {type(func)} - set key="
+        )
+    return h.hexdigest()
+
+
+def _update_argument_fingerprint(h, value, _seen=None):
+    """Feed an argument of cache into the digest h - pandas objects and arrays
+    by value (their reprs are truncated), containers recursively.
+    Raise TypeError for anything else whose repr might not identify it"""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(f"{type(value).__name__}{value.shape}".encode())
+        if isinstance(value, pd.Index):
+            value = value.to_series(index=pd.RangeIndex(len(value)))
+        if isinstance(value, pd.DataFrame):
+            h.update(
+                repr((list(value.columns), [str(x) for x in value.dtypes])).encode()
+            )
+        else:
+            h.update(repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray{value.shape}{value.dtype}".encode())
+        if value.dtype == object:
+            flat = pd.Series(value.ravel())
+            h.update(pd.util.hash_pandas_object(flat, index=False).values.tobytes())
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}(".encode())
+        for x in value:
+            _update_argument_fingerprint(h, x, _seen)
+        h.update(b")")
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}(".encode())
+        for k, v in sorted(value.items(), key=lambda kv: repr(kv[0])):
+            _update_argument_fingerprint(h, k, _seen)
+            _update_argument_fingerprint(h, v, _seen)
+        h.update(b")")
+    elif value is None or isinstance(
+        value, (str, bytes, bool, int, float, complex, np.generic, Path)
+    ):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif callable(value):
+        h.update(_stage_fingerprint(value, _seen).encode())
+    else:
+        raise TypeError(
+            f"cache: can't fingerprint {type(value)} - "
+            "set key= to name the stage and what it depends on instead"
+        )
+
+
+def _evict(path, max_bytes):
+    """Remove the least recently used cache files until at most max_bytes remain"""
+    entries = []
+    for fn in path.glob("*.parquet"):
+        try:
+            stat = fn.stat()
+        except FileNotFoundError:  # pragma: no cover - concurrent eviction
+            continue
+        entries.append((stat.st_mtime, stat.st_size, fn))
+    entries.sort()
+    total = sum(x[1] for x in entries)
+    for _mtime, size, fn in entries:
+        if total <= max_bytes:
+            break
+        try:
+            fn.unlink()
+        except FileNotFoundError:  # pragma: no cover
+            pass
+        total -= size
+
+
+@register_verb("cache", types=pd.DataFrame)
+def cache(
+    df,
+    func,
+    *args,
+    key=None,
+    path=".dppd_cache",
+    fingerprint="hash",
+    max_bytes=2**30,
+    **kwargs,
+):
+    """Verb: Return func(df, *args, **kwargs), cached on disk.
+
+    The cache key combines a fingerprint of df, key (or - if key is None -
+    func's module, name, bytecode and the values it closes over, its defaults
+    and the globals it reads) and args/kwargs (pandas objects and arrays by
+    value; values that can't be fingerprinted raise TypeError).
+    Results are stored as parquet files in path and always returned as read
+    back from there (so misses and hits agree), a hit marks its file as
+    recently used, and after each miss the least recently used files are
+    removed until the directory holds at most max_bytes.
+
+    Parameters
+    ----------
+        func : callable
+            the expensive stage, DataFrame -> DataFrame
+        key : str or None
+            name of the stage - set it if func or a value it reads can't be
+            fingerprinted, or it depends on more than those (files, ...)
+        path : str or Path
+            cache directory
+        fingerprint : 'hash' or 'schema'
+            'hash' hashes every value of df (safe, one pass over the data),
+            'schema' only columns, dtypes, shape and a sample of ~1000 rows
+            (cheap, misses changes between the sampled rows)
+        max_bytes : int
+            size bound of the cache directory
+
+    Example::
+
+        dp(df).cache(lambda df: dp(df).groupby('x').do(expensive).pd).select(...).pd
+    """
+    h = hashlib.sha256()
+    h.update(_frame_fingerprint(df, fingerprint).encode())
+    h.update((key if key is not None else _stage_fingerprint(func)).encode())
+    _update_argument_fingerprint(h, (args, kwargs))
+    path = Path(path)
+    fn = path / (h.hexdigest() + ".parquet")
+    if fn.exists():
+        os.utime(fn)
+        return pd.read_parquet(fn)
+    result = func(df, *args, **kwargs)
+    if not isinstance(result, pd.DataFrame):
+        raise TypeError(f"cache: func must return a DataFrame, returned {type(result)}")
+    path.mkdir(parents=True, exist_ok=True)
+    tmp = fn.with_name(fn.name + f".{os.getpid()}.tmp")
+    result.to_parquet(tmp)
+    os.replace(tmp, fn)
+    # return what later hits will see - the parquet round trip
+    # turns non-string column names into strings and so on
+    result = pd.read_parquet(fn)
+    _evict(path, max_bytes)
+    return result
@@ -0,0 +1,44 @@
+"""Lazily imported modules.
+
+Verbs depending on heavy or optional packages (scipy, sklearn, natsort,
+pyarrow) reference them via module level lazy_module objects,
+so that ``import dppd`` does not pay for - or require - them::
+
+    sklearn_decomposition = lazy_module("sklearn.decomposition")
+
+    @register_verb("pca", types=pd.DataFrame)
+    def pca_dataframe(df, whiten=False, ...):
+        p = sklearn_decomposition.PCA(...)
+
+The module is imported on first attribute access.
+"""
+
+import importlib
+
+
+class lazy_module:
+    """Stand-in for a module that is only imported on first attribute access"""
+
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+
+    def _load(self):
+        if self._lazy_module is None:
+            self._lazy_module = importlib.import_module(self._lazy_name)
+        return self._lazy_module
+
+    @property
+    def loaded(self):
+        """Whether the module has been imported (by us) already"""
+        return self._lazy_module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy_module {self._lazy_name!r} ({state})>"
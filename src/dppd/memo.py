@@ -0,0 +1,163 @@
+"""In-memory memoization of pure verb calls.
+
+Usage::
+
+    with memoize_verbs(max_bytes=2**30) as memo:
+        for request in requests:
+            dp(reference).select(...).spread('key', 'value').pd
+    print(memo.stats())
+
+Only verbs registered with ``register_verb(..., pure=True)`` are memoized,
+keyed by the identity of the DataFrame they are called on, their
+arguments and the dppd options (see :class:`dppd.base.option_context`).
+Entries are dropped when that DataFrame is garbage collected.
+
+Hits return the stored result itself, so a pipeline of pure verbs run
+again on the same frame hits at every step - each result is the frame
+the next verb is keyed on.
+
+Frames must not be modified in place while they are memoized (that includes
+the results, e.g. by assigning columns) - pandas offers no version counter
+to detect that.
+"""
+
+from collections import OrderedDict
+import weakref
+import pandas as pd
+from . import base
+
+
+class _Unhashable(Exception):
+    pass
+
+
+def _freeze(value):
+    """Turn (nested) lists, dicts and sets into hashable tuples,
+    raise _Unhashable for anything else that can't be hashed"""
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_freeze(x) for x in value)
+    elif isinstance(value, dict):
+        return ("dict",) + tuple(
+            sorted(((_freeze(k), _freeze(v)) for (k, v) in value.items()), key=repr)
+        )
+    elif isinstance(value, (set, frozenset)):
+        return ("set",) + tuple(sorted((_freeze(x) for x in value), key=repr))
+    elif isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        # hash() of pandas objects raises, and equality is elementwise
+        raise _Unhashable()
+    try:
+        hash(value)
+    except TypeError:
+        raise _Unhashable()
+    return (type(value), value)
+
+
+def _nbytes(obj):
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    else:
+        return int(obj.memory_usage(deep=True))
+
+
+class memoize_verbs:
+    """Context manager memoizing calls to pure verbs (see module docstring).
+
+    Hits return the stored result itself - don't modify it in place.
+
+    Parameters
+    ----------
+        max_bytes : int
+            bound on memory_usage(deep=True) of the stored results,
+            least recently used ones are evicted first
+
+    Attributes hits, misses, uncacheable (arguments that can't be hashed, or
+    results that are neither DataFrame nor Series), evictions and nbytes
+    count what happened - see stats().
+    """
+
+    def __init__(self, max_bytes=2**28):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (result, nbytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.evictions = 0
+        self._finalizers = {}  # id(frame) -> weakref.finalize
+
+    def _key(self, name, obj, args, kwargs):
+        return (
+            name,
+            type(obj),
+            id(obj),
+            _freeze(args),
+            _freeze(kwargs),
+            tuple(sorted(base.options.items())),  # e.g. arrow changes result dtypes
+        )
+
+    def __call__(self, name, obj, call, args, kwargs):
+        if (name, type(obj)) not in base.pure_verbs:
+            return call(*args, **kwargs)
+        try:
+            key = self._key(name, obj, args, kwargs)
+        except _Unhashable:
+            self.uncacheable += 1
+            return call(*args, **kwargs)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+        result = call(*args, **kwargs)
+        if not isinstance(result, (pd.DataFrame, pd.Series)):
+            self.uncacheable += 1
+            return result
+        self.misses += 1
+        self._store(key, obj, result)
+        return result
+
+    def _store(self, key, obj, result):
+        nbytes = _nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+        self.entries[key] = (result, nbytes)
+        self.nbytes += nbytes
+        frame_id = id(obj)
+        if frame_id not in self._finalizers:
+            self._finalizers[frame_id] = weakref.finalize(obj, self._purge, frame_id)
+        while self.nbytes > self.max_bytes:
+            _key, (_result, evicted_bytes) = self.entries.popitem(last=False)
+            self.nbytes -= evicted_bytes
+            self.evictions += 1
+
+    def _purge(self, frame_id):
+        """Drop the entries of a garbage collected frame (its id may be reused)"""
+        self._finalizers.pop(frame_id, None)
+        for key in [k for k in self.entries if k[2] == frame_id]:
+            self.nbytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        """Drop all entries (the statistics are kept)"""
+        for finalizer in self._finalizers.values():
+            finalizer.detach()
+        self._finalizers.clear()
+        self.entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        """hits, misses, uncacheable, evictions, entries and nbytes as dict"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "nbytes": self.nbytes,
+        }
+
+    def __enter__(self):
+        base.verb_call_observers.append(self)
+        return self
+
+    def __exit__(self, _type, _value, _traceback):
+        base.verb_call_observers.remove(self)
+        self.clear()
@@ -0,0 +1,309 @@
+"""Per-verb timing and memory instrumentation.
+
+Usage::
+
+    with profile_verbs() as profiler:
+        dp(df).groupby('x').mutate(y=...).summarize(...).pd
+    print(profiler.to_frame())
+
+or set the environment variable DPPD_PROFILE (to 1, 'memory' or 'deep')
+before importing dppd, to have every verb call reported on stderr.
+
+To look at a pipeline in a flamegraph viewer (chrome://tracing, Perfetto,
+speedscope)::
+
+    with trace_verbs() as tracer:
+        dp(df).groupby('x').do(...).pd
+    tracer.to_chrome_trace('pipeline.json')
+
+tracer.to_otlp() gives the same spans as OpenTelemetry (OTLP/JSON) structure.
+
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import pandas as pd
+from . import base
+
+
+def _unwrap(obj):
+    if isinstance(obj, pd.core.groupby.GroupBy):
+        return obj._selected_obj
+    return obj
+
+
+def _shape(obj):
+    obj = _unwrap(obj)
+    if isinstance(obj, pd.DataFrame):
+        return obj.shape
+    elif isinstance(obj, pd.Series):
+        return len(obj), 1
+    else:
+        return None, None
+
+
+def _memory(obj, deep):
+    obj = _unwrap(obj)
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=deep).sum())
+    elif isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=deep))
+    else:
+        return None
+
+
+class profile_verbs:
+    """Context manager recording one dict per verb call.
+
+    Records contain verb, type, depth (nesting level of verbs called by verbs),
+    wall_time and cpu_time (seconds), rows_in, columns_in, rows_out, columns_out
+    and, if memory is set, memory_in, memory_out and memory_delta (bytes,
+    via DataFrame.memory_usage(deep=deep)).
+
+    Verbs returning generators are only timed until the generator is created.
+
+    Parameters
+    ----------
+        sink : callable or None
+            called with each record - default: append to self.records
+        memory : bool
+            measure memory usage of input and output (costs a pass over the
+            data if deep is set)
+        deep : bool
+            passed to memory_usage
+    """
+
+    def __init__(self, sink=None, memory=False, deep=False):
+        self.records = []
+        self.sink = sink if sink is not None else self.records.append
+        self.memory = memory
+        self.deep = deep
+        self.depth = 0
+
+    def __call__(self, name, obj, call, args, kwargs):
+        rows_in, columns_in = _shape(obj)
+        if self.memory:
+            memory_in = _memory(obj, self.deep)
+        depth = self.depth
+        self.depth += 1
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            result = call(*args, **kwargs)
+        finally:
+            self.depth -= 1
+        wall_time = time.perf_counter() - start_wall
+        cpu_time = time.process_time() - start_cpu
+        rows_out, columns_out = _shape(result)
+        record = {
+            "verb": name,
+            "type": type(obj).__name__,
+            "depth": depth,
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "rows_in": rows_in,
+            "columns_in": columns_in,
+            "rows_out": rows_out,
+            "columns_out": columns_out,
+        }
+        if self.memory:
+            memory_out = _memory(result, self.deep)
+            record["memory_in"] = memory_in
+            record["memory_out"] = memory_out
+            if memory_in is not None and memory_out is not None:
+                record["memory_delta"] = memory_out - memory_in
+            else:
+                record["memory_delta"] = None
+        self.sink(record)
+        return result
+
+    def __enter__(self):
+        base.verb_call_observers.append(self)
+        return self
+
+    def __exit__(self, _type, _value, _traceback):
+        base.verb_call_observers.remove(self)
+
+    def to_frame(self):
+        """The records as a DataFrame"""
+        return pd.DataFrame(self.records)
+
+
+class trace_verbs:
+    """Context manager recording nested spans for verb calls
+    and the per group iterations inside do, summarize and (callable) mutate.
+
+    Spans are dicts with name, category ('verb' or 'group'), span_id,
+    parent_id, thread, start and end (time.time_ns() based nanoseconds)
+    and args (type and shapes for verbs, the group key and rows for groups).
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._stack = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+        # anchor perf_counter_ns to the wall clock once
+        self._offset = time.time_ns() - time.perf_counter_ns()
+
+    def _now(self):
+        return time.perf_counter_ns() + self._offset
+
+    def _begin(self, name, category, args):
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+        span = {
+            "name": name,
+            "category": category,
+            "span_id": span_id,
+            "parent_id": self._stack[-1]["span_id"] if self._stack else None,
+            "thread": threading.get_ident(),
+            "start": self._now(),
+            "end": None,
+            "args": args,
+        }
+        self._stack.append(span)
+        return span
+
+    def _end(self, span):
+        span["end"] = self._now()
+        self._stack.remove(span)
+        self.spans.append(span)
+
+    def __call__(self, name, obj, call, args, kwargs):
+        rows_in, columns_in = _shape(obj)
+        span = self._begin(
+            name,
+            "verb",
+            {"type": type(obj).__name__, "rows_in": rows_in, "columns_in": columns_in},
+        )
+        try:
+            result = call(*args, **kwargs)
+        except Exception as e:
+            span["args"]["error"] = repr(e)
+            raise
+        else:
+            rows_out, columns_out = _shape(result)
+            span["args"]["rows_out"] = rows_out
+            span["args"]["columns_out"] = columns_out
+        finally:
+            self._end(span)
+        return result
+
+    def group_begin(self, name, key, sub_df):
+        self._begin(
+            f"{name} group", "group", {"group": str(key), "rows": _shape(sub_df)[0]}
+        )
+
+    def group_end(self, name, key, sub_df):
+        self._end(self._stack[-1])
+
+    def __enter__(self):
+        base.verb_call_observers.append(self)
+        return self
+
+    def __exit__(self, _type, _value, _traceback):
+        base.verb_call_observers.remove(self)
+
+    def to_chrome_trace(self, filename=None):
+        """Spans in the Chrome trace event format ('complete' events,
+        microseconds). Written to filename as json if given, returned otherwise"""
+        pid = os.getpid()
+        events = []
+        for span in sorted(self.spans, key=lambda span: span["start"]):
+            events.append(
+                {
+                    "name": span["name"],
+                    "cat": span["category"],
+                    "ph": "X",
+                    "ts": span["start"] / 1000,
+                    "dur": (span["end"] - span["start"]) / 1000,
+                    "pid": pid,
+                    "tid": span["thread"],
+                    "args": span["args"],
+                }
+            )
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if filename is None:
+            return trace
+        with open(filename, "w") as op:
+            json.dump(trace, op)
+
+    def to_otlp(self, filename=None, service_name="dppd"):
+        """Spans as an OpenTelemetry ExportTraceServiceRequest (OTLP/JSON encoding),
+        suitable for POSTing to a local collector's /v1/traces.
+        Written to filename as json if given, returned otherwise"""
+        trace_id = os.urandom(16).hex()
+        span_ids = {span["span_id"]: os.urandom(8).hex() for span in self.spans}
+        spans = []
+        for span in sorted(self.spans, key=lambda span: span["start"]):
+            spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": span_ids[span["span_id"]],
+                    "parentSpanId": span_ids.get(span["parent_id"], ""),
+                    "name": span["name"],
+                    "kind": 1,  # SPAN_KIND_INTERNAL
+                    "startTimeUnixNano": str(span["start"]),
+                    "endTimeUnixNano": str(span["end"]),
+                    "attributes": [
+                        _otlp_attribute("dppd." + k, v)
+                        for (k, v) in span["args"].items()
+                        if v is not None
+                    ]
+                    + [_otlp_attribute("dppd.category", span["category"])],
+                    "status": {"code": 2 if "error" in span["args"] else 0},
+                }
+            )
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", service_name)]
+                    },
+                    "scopeSpans": [{"scope": {"name": "dppd"}, "spans": spans}],
+                }
+            ]
+        }
+        if filename is None:
+            return request
+        with open(filename, "w") as op:
+            json.dump(request, op)
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        value = {"boolValue": value}
+    elif isinstance(value, int):
+        value = {"intValue": str(value)}
+    elif isinstance(value, float):
+        value = {"doubleValue": value}
+    else:
+        value = {"stringValue": str(value)}
+    return {"key": key, "value": value}
+
+
+def stderr_sink(record):
+    """Print a record as one tab seperated line to stderr"""
+    print(
+        "dppd\t" + "\t".join(f"{k}={v}" for (k, v) in record.items()),
+        file=sys.stderr,
+    )
+
+
+def profile_from_environment():
+    """Install a profile_verbs reporting to stderr if DPPD_PROFILE is set
+    (1: timings, 'memory': + memory_usage(deep=False), 'deep': + memory_usage(deep=True))
+    """
+    mode = os.environ.get("DPPD_PROFILE", "")
+    if mode in ("", "0"):
+        return None
+    profiler = profile_verbs(
+        stderr_sink, memory=mode in ("memory", "deep"), deep=mode == "deep"
+    )
+    profiler.__enter__()
+    return profiler
@@ -1,7 +1,22 @@
+import warnings
 import pandas as pd
 import numpy as np
-from .base import register_verb, register_type_methods_as_verbs
+from pandas.core.sorting import get_group_index_sorter
+from .base import (
+    register_verb,
+    register_type_methods_as_verbs,
+    observe_groups,
+    options,
+)
 from .column_spec import parse_column_specification, series_and_strings_to_names
+from .lazy import lazy_module
+
+natsort = lazy_module("natsort")
+pa = lazy_module("pyarrow")
+pc = lazy_module("pyarrow.compute")
+scipy_sparse = lazy_module("scipy.sparse")
+sklearn_decomposition = lazy_module("sklearn.decomposition")
+sklearn_utils = lazy_module("sklearn.utils")
 
 # register all pandas.DataFrame functions and properties.
 DataFrameGroupBy = pd.core.groupby.DataFrameGroupBy
@@ -44,6 +59,85 @@ def group_extract_params(grp):
     return res
 
 
+def regroup_unchanged(grp, df):
+    """Group df just like grp, reusing grp's already factorized grouper.
+
+    Only valid if df has exactly the rows of grp (same order) and unchanged group
+    columns - e.g. after selecting or adding columns.
+    """
+    if not hasattr(grp, "_grouper"):  # pragma: no cover
+        return df.groupby(**group_extract_params(grp))
+    return type(grp)(
+        df,
+        keys=grp.keys,
+        level=grp.level,
+        grouper=grp._grouper,
+        exclusions=grp.exclusions,
+        as_index=grp.as_index,
+        sort=grp.sort,
+        group_keys=grp.group_keys,
+        observed=grp.observed,
+        dropna=grp.dropna,
+    )
+
+
+def regroup_rows(grp, df, positions):
+    """Group df - the rows of grp's frame at positions - just like grp, carrying
+    grp's group codes over instead of factorizing the group values again.
+
+    Only valid if every group keeps at least one row and positions are ordered
+    by group code (so that the group order matches a fresh groupby). Falls back
+    to a regular groupby for groupings it can't carry over (e.g. pd.Grouper),
+    and for categorical groupings with observed=False - their groups are the
+    product of each grouping's values, which must be those of the kept rows.
+    """
+    old = getattr(grp, "_grouper", None)
+    if old is None or type(old) is not pd.core.groupby.ops.BaseGrouper:
+        return df.groupby(**group_extract_params(grp))
+    if not grp.observed and any(
+        getattr(ping, "_passed_categorical", False) for ping in old.groupings
+    ):
+        return df.groupby(**group_extract_params(grp))
+    groupings = []
+    for ping in old.groupings:
+        if ping.level is not None:
+            grouper = None
+        elif isinstance(ping._orig_grouper, (pd.Series, pd.Index, np.ndarray)):
+            if isinstance(ping._orig_grouper, np.ndarray):
+                grouper = ping._orig_grouper[positions]
+            else:
+                grouper = ping._orig_grouper.take(positions)
+        else:  # pragma: no cover
+            return df.groupby(**group_extract_params(grp))
+        codes, uniques = ping._codes_and_uniques
+        new = type(ping)(
+            df.index,
+            grouper=grouper,
+            obj=df,
+            level=ping.level,
+            sort=ping._sort,
+            observed=ping._observed,
+            in_axis=ping.in_axis,
+            dropna=ping._dropna,
+        )
+        # cache_readonly - set before first use, so nothing is factorized
+        new._cache["_codes_and_uniques"] = (codes[positions], uniques)
+        groupings.append(new)
+    grouper = type(old)(df.index, groupings, sort=old._sort, dropna=old.dropna)
+    return type(grp)(
+        df,
+        keys=grp.keys,
+        level=grp.level,
+        grouper=grouper,
+        exclusions=grp.exclusions,
+        as_index=grp.as_index,
+        sort=grp.sort,
+        group_keys=grp.group_keys,
+        observed=grp.observed,
+        dropna=grp.dropna,
+    )
+
+
 # verbs
 
 
@@ -98,19 +192,58 @@ def ungroup_DataFrameGroupBy(grp):
 
 
 @register_verb(["iter_tuples", "itertuples"], types=[DataFrameGroupBy])
-def iter_tuples_DataFrameGroupBy(grp):
+def iter_tuples_DataFrameGroupBy(grp, lazy=False):
+    """Verb: yield (group_key_tuple, [row namedtuples]) for each group.
+
+    Groups come in order of their first row. Rows with missing group keys
+    (which the GroupBy drops) are yielded as groups of their own, e.g. (None,).
+    Reuses the GroupBy's group numbers instead of rebuilding the keys row by row.
+
+    Parameters
+    ----------
+    lazy : bool
+        if True, the rows of a group are only turned into tuples once that group
+        is reached, and are yielded as an iterator instead of a list. Use this
+        if you might stop early.
+    """
     df = grp._selected_obj
-    columns = group_variables(grp)
-    by_key = {}
-    for tup in df.itertuples():
-        key = tuple(
-            (getattr(tup, c) for c in columns)
-        )  # replacing this by a evaled() lambda offers no speedup
-        if not key in by_key:
-            by_key[key] = []
-        by_key[key].append(tup)
-    for key, tups in by_key.items():
-        yield key, tups
+    key_columns = [
+        df[c] if c in df.columns else pd.Series(df.index.get_level_values(c))
+        for c in group_variables(grp)
+    ]
+    labels = grp.ngroup().to_numpy()
+    if labels.dtype.kind == "f":  # NaN: missing key
+        missing = np.isnan(labels)
+        if missing.any():
+            # number the missing key combinations after the GroupBy's groups
+            missing_keys = pd.DataFrame(
+                {ii: c.to_numpy()[missing] for (ii, c) in enumerate(key_columns)}
+            )
+            labels[missing] = (
+                grp.ngroups
+                + missing_keys.groupby(
+                    list(missing_keys.columns), dropna=False, sort=False
+                )
+                .ngroup()
+                .to_numpy()
+            )
+        labels = labels.astype(np.intp)
+    label_count = labels.max() + 1 if len(labels) else 0
+    rows = get_group_index_sorter(labels, label_count)
+    counts = np.bincount(labels, minlength=label_count)
+    starts = np.cumsum(counts) - counts
+    first_rows = rows[starts]
+    order = np.argsort(first_rows, kind="stable")
+    # keys as python scalars, read off each group's first row
+    keys = zip(*[c.take(first_rows[order]).tolist() for c in key_columns])
+    if not lazy:
+        all_tuples = list(df.itertuples())
+    for label, key in zip(order, keys):
+        idx = rows[starts[label] : starts[label] + counts[label]]
+        if lazy:
+            yield key, df.iloc[idx].itertuples()
+        else:
+            yield key, [all_tuples[ii] for ii in idx]
 
 
 @register_verb("concat", types=[pd.DataFrame, pd.Series])
@@ -130,7 +263,7 @@ def concat_DataFrame(df, other, axis=0):
         return pd.concat([df, other], axis=axis)
 
 
-@register_verb("select", types=[pd.DataFrame])
+@register_verb("select", types=[pd.DataFrame], pure=True)
 def select_DataFrame(df, columns):
     """Verb: Pick columns from a DataFrame
 
@@ -149,7 +282,7 @@ def select_DataFrame(df, columns):
     return df.loc[:, columns]
 
 
-@register_verb("select_and_rename", types=[pd.DataFrame])
+@register_verb("select_and_rename", types=[pd.DataFrame], pure=True)
 def select_and_rename_DataFrame(df, columns):
     """Verb: Pick columns from a DataFrame, and rename them in the process
 
@@ -184,10 +317,10 @@ def select_DataFrameGroupBy(grp, columns):
         if not grp_by in columns:
             columns.append(grp_by)
     df_out = df.loc[:, columns]
-    return df_out.groupby(**grp_params)
+    return regroup_unchanged(grp, df_out)
 
 
-@register_verb("unselect", types=[pd.Series, pd.DataFrame])
+@register_verb("unselect", types=[pd.Series, pd.DataFrame], pure=True)
 def unselect_DataFrame(df, columns):
     """Verb: Select via an inversed column spec (ie. everything but these)
 
@@ -218,7 +351,7 @@ def unselect_DataFrameGroupBy(grp, columns):
     )  # we want to keep the order if the user passed one in
     columns = [x for x in df.columns if (x not in columns) or (x in grp_params["by"])]
     df_out = df.loc[:, columns]
-    return df_out.groupby(**grp_params)
+    return regroup_unchanged(grp, df_out)
 
 
 @register_verb("drop", types=DataFrameGroupBy)
@@ -242,7 +375,7 @@ def itergroups_DataFrameGroupBy(grp):
     yield from grp
 
 
-@register_verb(name="distinct", types=pd.DataFrame)
+@register_verb(name="distinct", types=pd.DataFrame, pure=True)
 def distinct_dataframe(df, column_spec=None, keep="first"):
     """Verb: select distinct/unique rows
 
@@ -266,7 +399,7 @@ def distinct_dataframe(df, column_spec=None, keep="first"):
     return df[~duplicated]
 
 
-@register_verb(name="distinct", types=pd.Series)
+@register_verb(name="distinct", types=pd.Series, pure=True)
 def distinct_series(df, keep="first"):
     """Verb: select distinct values from Series
 
@@ -337,6 +470,21 @@ def mutate_DataFrame(df, **kwargs):
     return df.assign(**to_assign)
 
 
+def _broadcast_arrow(grp, v):
+    """Per group values v (indexed by group key) -> one value per row,
+    vectorized via the group numbers, object results become pyarrow backed"""
+    codes = grp.ngroup().fillna(-1).to_numpy(dtype=np.int64)  # NaN: dropped key
+    if hasattr(grp, "_grouper"):
+        keys = grp._grouper.result_index
+    else:  # pragma: no cover
+        keys = grp.grouper.result_index
+    values = v.reindex(keys).array.take(codes, allow_fill=True)
+    result = pd.Series(values, index=grp._selected_obj.index)
+    if result.dtype == object:
+        result = result.convert_dtypes(dtype_backend="pyarrow")
+    return result
+
+
 @register_verb(["mutate", "define"], types=[DataFrameGroupBy])
 def mutate_DataFrameGroupBy(grp, **kwargs):
     """Verb: add columns to the DataFrame used in the GroupBy.
@@ -376,7 +524,7 @@ def mutate_DataFrameGroupBy(grp, **kwargs):
         elif callable(v):
             v_out = []
             parts = []
-            for idx, sub_df in grp:
+            for idx, sub_df in observe_groups("mutate", grp):
                 if not isinstance(idx, tuple):
                     idx = (idx,)
                 r = v(sub_df)
@@ -398,10 +546,13 @@ def mutate_DataFrameGroupBy(grp, **kwargs):
             else:
                 group_indices = grp.groups
                 if set(group_indices.keys()) == set(v.index):
-                    keep = pd.Series(None, index=df.index, dtype=object)
-                    for group_key, idx in group_indices.items():
-                        keep[idx] = v.loc[group_key]
-                    v_out = keep
+                    if options["arrow"]:
+                        v_out = _broadcast_arrow(grp, v)
+                    else:
+                        keep = pd.Series(None, index=df.index, dtype=object)
+                        for group_key, idx in group_indices.items():
+                            keep[idx] = v.loc[group_key]
+                        v_out = keep
                 else:
                     raise pd.core.indexing.IndexingError(
                         "Passed series index did not match grouped or ungrouped index"
@@ -411,7 +562,10 @@ def mutate_DataFrameGroupBy(grp, **kwargs):
             v_out = v
         to_assign[k] = v_out
     df_out = df.assign(**to_assign)
-    return df_out.groupby(**grp_params)
+    if any(k in grp_params["by"] for k in to_assign):
+        return df_out.groupby(**grp_params)
+    else:
+        return regroup_unchanged(grp, df_out)
 
 
 @register_verb("filter_by", types=[pd.DataFrame, DataFrameGroupBy])
@@ -486,12 +640,31 @@ def filter_by(obj, filter_arg):
 
 
 @register_verb("add_count", types=[pd.DataFrame, DataFrameGroupBy])
-def add_count(df):
-    """Verb: Add the cardinality of a row's group to the row as column 'count'"""
-    from .base import dppd
+def add_count(obj, name="count", wt=None):
+    """Verb: Add the cardinality of a row's group to the row as column 'count'
 
-    with dppd(df) as (dp, X):
-        return dp.mutate(count=len).pd
+    Uses the grouper's group sizes - one vectorized operation, no matter
+    how many groups there are.
+
+    Parameters
+    ----------
+    name : str
+        name of the new column
+    wt : str, pd.Series or SeriesGroupBy
+        if set, sum this column per group instead of counting rows (like dplyr's wt=)
+    """
+    if isinstance(wt, SeriesGroupBy):
+        wt = wt.obj.name
+    elif wt is not None:
+        wt = series_and_strings_to_names([wt])[0]
+    if isinstance(obj, pd.DataFrame):
+        count = len(obj) if wt is None else obj[wt].sum()
+        return mutate_DataFrame(obj, **{name: count})
+    if wt is None:
+        count = obj.transform("size")
+    else:
+        count = obj[wt].transform("sum")
+    return mutate_DataFrameGroupBy(obj, **{name: count})
 
 
 @register_verb(["summarize", "summarise"], types=[pd.DataFrame, DataFrameGroupBy])
@@ -543,7 +716,7 @@ def summarize(obj, *args):
         for g in groups:
             result[g] = []
 
-    for idx, sub_df in it:
+    for idx, sub_df in observe_groups("summarize", it):
         if groups is not None:
             if isinstance(idx, tuple):
                 for g, i in zip(groups, idx):
@@ -605,7 +778,7 @@ def do(obj, func, *args, **kwargs):
         it = obj
 
     new_dfs = []
-    for idx, sub_df in it:
+    for idx, sub_df in observe_groups("do", it):
         ndf = func(sub_df, *args, **kwargs)
         if groups is not None:
             if not isinstance(idx, tuple):
@@ -630,8 +803,54 @@ def do(obj, func, *args, **kwargs):
     return result
 
 
-@register_verb(types=pd.DataFrame)
-def gather(df, key, value, value_var_column_spec=None):
+def _gather_block(
+    df, id_vars, value_vars, key, value, offset, key_categories, arrow_key=False
+):
+    """Melt value_vars (which start at position offset within all gathered columns)
+    into a key/value frame, replicating the id_vars only for this block."""
+    n = len(df)
+    rows = np.tile(np.arange(n), len(value_vars))
+    result = df[id_vars].take(rows)
+    result.index = pd.RangeIndex(offset * n, (offset + len(value_vars)) * n)
+    if key_categories is not None:
+        codes = np.repeat(np.arange(offset, offset + len(value_vars)), n)
+        result[key] = pd.Categorical.from_codes(codes, categories=key_categories)
+    elif arrow_key:
+        keys = pa.array(list(value_vars)).take(
+            pa.array(np.repeat(np.arange(len(value_vars)), n))
+        )
+        result[key] = pd.arrays.ArrowExtensionArray(keys)
+    else:
+        result[key] = np.repeat(np.array(value_vars, dtype=object), n)
+    result[value] = pd.concat([df[c] for c in value_vars], ignore_index=True).values
+    return result
+
+
+def _gather_blocks(
+    df, id_vars, value_vars, key, value, chunk_size, key_categories, arrow_key
+):
+    for start in range(0, len(value_vars), chunk_size):
+        yield _gather_block(
+            df,
+            id_vars,
+            value_vars[start : start + chunk_size],
+            key,
+            value,
+            start,
+            key_categories,
+            arrow_key,
+        )
+
+
+@register_verb(types=pd.DataFrame, pure=True)
+def gather(
+    df,
+    key,
+    value,
+    value_var_column_spec=None,
+    categorical_key=False,
+    chunk_size=None,
+):
     """Verb: Gather multiple columns and collapse them into two.
 
     This used to be called melting and this is a column spec aware
@@ -648,6 +867,16 @@ def gather(df, key, value, value_var_column_spec=None):
     value_var_column_spec : column specification
         which columns contain the values to be mapped into key/value pairs?
         see :func:`dppd.single_verbs.parse_column_specification`
+    categorical_key : bool
+        emit the key column as a pd.Categorical over the gathered column
+        names instead of object strings - much smaller for wide frames.
+    chunk_size : int or None
+        if set, return a generator of DataFrames, each covering at most chunk_size
+        of the gathered columns. The id columns are only replicated per block,
+        and pd.concat(blocks) equals the non-chunked result.
+
+    With the arrow option set (see :class:`dppd.base.option_context`), the key
+    column is pyarrow backed instead of object strings.
 
 
     Inverse of :func:`dppd.single_verbs.spread <spread>`.
@@ -670,10 +899,23 @@ def gather(df, key, value, value_var_column_spec=None):
 
     value_vars = parse_column_specification(df, value_var_column_spec, return_list=True)
     id_vars = [x for x in df.columns if x not in value_vars]
-    return pd.melt(df, id_vars, value_vars, var_name=key, value_name=value)
+    arrow_key = options["arrow"] and not categorical_key
+    if chunk_size is None and not categorical_key and not arrow_key:
+        return pd.melt(df, id_vars, value_vars, var_name=key, value_name=value)
+    value_vars = list(value_vars)
+    key_categories = pd.Index(value_vars) if categorical_key else None
+    if chunk_size is None:
+        return _gather_block(
+            df, id_vars, value_vars, key, value, 0, key_categories, arrow_key
+        )
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    return _gather_blocks(
+        df, id_vars, value_vars, key, value, chunk_size, key_categories, arrow_key
+    )
 
 
-@register_verb(types=pd.DataFrame)
+@register_verb(types=pd.DataFrame, pure=True)
 def spread(df, key, value):
     """Verb: Spread a key-value pair across multiple columns
 
@@ -727,7 +969,7 @@ def spread(df, key, value):
     return result
 
 
-@register_verb(types=pd.DataFrame)
+@register_verb(types=pd.DataFrame, pure=True)
 def unite(df, column_spec, sep="_"):
     """Verb: string join multiple columns
 
@@ -739,14 +981,80 @@ def unite(df, column_spec, sep="_"):
 
     sep : str
         Seperator to join on
+
+    With the arrow option set (see :class:`dppd.base.option_context`) the join
+    runs in pyarrow.compute and returns a pyarrow backed string Series.
     """
 
     columns = parse_column_specification(df, column_spec, return_list=True)
+    if options["arrow"]:
+        strings = [
+            pa.array(df[c].astype(str).to_numpy(dtype=object), type=pa.string())
+            for c in columns
+        ]
+        joined = pc.binary_join_element_wise(*strings, sep)
+        return pd.Series(pd.arrays.ArrowExtensionArray(joined), index=df.index)
     return df[columns].apply(lambda x: sep.join(x.astype(str)), axis=1)
 
 
-@register_verb(types=pd.DataFrame)
-def seperate(df, column, new_names, sep=".", remove=False):
+def _is_arrow_string(dtype):
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage != "python"
+    elif isinstance(dtype, pd.ArrowDtype):
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(
+            dtype.pyarrow_dtype
+        )
+    return False
+
+
+def _split_arrow(c, sep, n, regex):
+    """Split an arrow backed string Series with pyarrow.compute,
+    returning one arrow backed array per piece"""
+    if regex is None:
+        regex = len(sep) > 1
+    split = pc.split_pattern_regex if regex else pc.split_pattern
+    max_splits = n if (n is not None and n > 0) else None
+    arr = pa.array(c.array)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    lists = split(arr, pattern=sep, max_splits=max_splits)
+    values = lists.values
+    starts = lists.offsets.to_numpy()[:-1]
+    lengths = pc.list_value_length(lists).fill_null(0).to_numpy()
+    piece_count = int(lengths.max()) if len(lengths) else 0
+    pieces = []
+    for ii in range(piece_count):
+        index = pa.array(starts + ii, mask=lengths <= ii)
+        pieces.append(pd.array(values.take(index), dtype=c.dtype))
+    return pieces
+
+
+def _partition_object(c, sep):
+    """Split an object string column once on a literal sep with str.partition.
+
+    Much faster than str.split(expand=True), which builds a list per row.
+    Returns the pieces like str.split would, or None if c holds anything but
+    strings, None and nan.
+    """
+    values = c.to_numpy()
+    parts = [x.partition(sep) if isinstance(x, str) else x for x in values]
+    found = False
+    for x in parts:
+        if isinstance(x, tuple):
+            found = found or bool(x[1])
+        elif x is not None and not (isinstance(x, float) and np.isnan(x)):
+            return None
+    heads = np.empty(len(parts), dtype=object)
+    heads[:] = [x[0] if isinstance(x, tuple) else x for x in parts]
+    if not found:
+        return [heads]
+    tails = np.empty(len(parts), dtype=object)
+    tails[:] = [(x[2] if x[1] else None) if isinstance(x, tuple) else x for x in parts]
+    return [heads, tails]
+
+
+@register_verb(types=pd.DataFrame, pure=True)
+def seperate(df, column, new_names, sep=".", remove=False, n=-1, regex=None):
     """Verb: split strings on a seperator.
 
     Inverse of :func:`unite`
@@ -761,6 +1069,18 @@ def seperate(df, column, new_names, sep=".", remove=False):
         what to split on (pd.Series.str.split)
     remove : bool
         wether to drop column
+    n : int
+        split at most n times (-1, 0 or None: all) - the last piece keeps the remainder,
+        use len(new_names) - 1 to not materialize unused pieces
+    regex : bool or None
+        see :meth:`pandas.Series.str.split` - None: sep is a regexp if len(sep) > 1
+
+    Arrow backed string columns (and object string columns if the arrow
+    option is set, see :class:`dppd.base.option_context`) are split with
+    pyarrow.compute. Object string columns split once (n=1) on a literal sep
+    use str.partition. The new columns are added to a shallow copy of df - the
+    existing columns share df's values, like select's result (writing to them
+    writes through unless pandas' copy_on_write is on).
     """
 
     column = parse_column_specification(df, column, return_list=True)
@@ -771,12 +1091,38 @@ def seperate(df, column, new_names, sep=".", remove=False):
         raise ValueError(
             "Multiple columns with the same name - don't know which one to pick"
         )
-    s = c.str.split(sep, expand=True)
-    s.columns = new_names
-    s.index = df.index
+    if n is None:
+        n = -1
+    if (
+        options["arrow"]
+        and c.dtype == object
+        and pd.api.types.infer_dtype(c, skipna=True) == "string"
+    ):
+        c = c.astype(pd.ArrowDtype(pa.string()))
+    pieces = None
+    if _is_arrow_string(c.dtype):
+        pieces = _split_arrow(c, sep, n, regex)
+    elif (
+        n == 1
+        and c.dtype == object
+        and isinstance(sep, str)
+        and sep
+        and (regex is False or (regex is None and len(sep) == 1))
+    ):
+        pieces = _partition_object(c, sep)
+    if pieces is None:
+        s = c.str.split(sep, n=n, expand=True, regex=regex)
+        pieces = [s.iloc[:, ii].values for ii in range(s.shape[1])]
+    if len(pieces) != len(new_names):
+        raise ValueError(
+            f"Split produced {len(pieces)} columns, but {len(new_names)} new_names were passed"
+        )
     if remove:
-        df = df.drop(column, axis=1)
-    result = pd.concat([df, s], axis=1)
+        result = df.drop(column, axis=1)
+    else:
+        result = df.copy(deep=False)
+    for name, piece in zip(new_names, pieces):
+        result[name] = piece
     return result
 
 
@@ -790,7 +1136,7 @@ def print_DataFrameGroupBy(grps):
     return grps
 
 
-@register_verb("arrange", types=pd.DataFrame)
+@register_verb("arrange", types=pd.DataFrame, pure=True)
 def arrange_DataFrame(df, column_spec, kind="quicksort", na_position="last"):
     """Sort DataFrame based on column spec.
 
@@ -816,14 +1162,99 @@ def arrange_DataFrame(df, column_spec, kind="quicksort", na_position="last"):
     )
 
 
+def _sort_keys(series, ascending, na_position):
+    """Keys for np.lexsort ordering series' values like sort_values would
+    (least significant first)"""
+    numpy_numeric = isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf"
+    values = series.to_numpy() if numpy_numeric else None
+    if values is not None and values.dtype.kind in "biu":
+        if values.dtype.kind == "b":
+            values = values.view(np.uint8)
+        return [values if ascending else ~values]  # ~ reverses any int order
+    if values is not None:  # float
+        missing = np.isnan(values)
+        keys = [values if ascending else -values]
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+        codes = codes.astype(np.int64)
+        missing = codes < 0
+        if not ascending:
+            codes = len(uniques) - 1 - codes
+        keys = [codes]
+    if missing.any():
+        keys.append(missing if na_position == "last" else ~missing)
+    return keys
+
+
+def _group_sort_order(group_codes, df, columns, ascending, na_position):
+    """Positions sorting df's rows (df may also be a dict of Series)
+    by group_codes (an array, or a list of them - most significant first),
+    then by columns - one stable np.lexsort, values are never compared as objects"""
+    if isinstance(group_codes, np.ndarray):
+        group_codes = [group_codes]
+    keys = []
+    for c, asc in reversed(list(zip(columns, ascending))):
+        keys.extend(_sort_keys(df[c], asc, na_position))
+    return np.lexsort(keys + group_codes[::-1])
+
+
+def _grouping_codes(grp, na_position):
+    """Each grouping's codes, missing values (-1) placed per na_position"""
+    result = []
+    for ping in grp._grouper.groupings:
+        codes = np.asarray(ping.codes)
+        if na_position == "last":
+            codes = np.where(codes < 0, np.iinfo(codes.dtype).max, codes)
+        result.append(codes)
+    return result
+
+
 @register_verb("arrange", types=DataFrameGroupBy)
-def arrange_DataFrameGroupBy(grp, column_spec, kind="quicksort", na_position="last"):
+def arrange_DataFrameGroupBy(
+    grp, column_spec, kind="quicksort", na_position="last", by_group_codes=False
+):
+    """Sort within groups based on column spec.
+
+    Parameters
+    ----------
+        column_spec : column specification
+            see :func:`dppd.single_verbs.parse_column_specification`
+        by_group_codes : bool
+            Use the grouper's integer group numbers (:meth:`GroupBy.ngroup`) as
+            leading sort key instead of comparing the group values themselves -
+            much faster for long string keys. Groups then appear in the
+            GroupBy's own group order, the sort is always stable (kind is ignored),
+            and the result reuses the grouper's codes instead of grouping again.
+            Rows with missing keys are placed by the keys they have, like
+            sort_values does (for sort=True groupbys).
+
+        ... :  see :meth:`pandas.DataFrame.sort_values`
+    """
     df = grp._selected_obj
     grp_params = group_extract_params(grp)
 
     cols_plus_inversed = parse_column_specification(df, column_spec, return_list=2)
     if not cols_plus_inversed:
         raise ValueError("No columns passed spec - don't know how to sort")
+    if by_group_codes:
+        columns = [x[0] for x in cols_plus_inversed]
+        ascending = [not x[1] for x in cols_plus_inversed]
+        # NaN: rows with a dropped (missing) key - placed like sort_values would
+        group_codes = grp.ngroup()
+        missing = group_codes.isnull().to_numpy()
+        codes = group_codes.fillna(
+            grp.ngroups if na_position == "last" else -1
+        ).to_numpy(dtype=np.int32 if grp.ngroups < 2**31 - 1 else np.int64)
+        if missing.any():
+            # they share one group code - order them by the keys they do have
+            if grp.sort:
+                # sorted group numbers follow the grouping codes, so those
+                # place them within the groups like sort_values
+                codes = _grouping_codes(grp, na_position)
+            else:
+                codes = [codes] + _grouping_codes(grp, na_position)
+        order = _group_sort_order(codes, df, columns, ascending, na_position)
+        return regroup_rows(grp, df.iloc[order], order)
     columns = grp_params["by"].copy()
     ascending = [True] * len(columns)
     columns += [x[0] for x in cols_plus_inversed]
@@ -837,20 +1268,142 @@ def arrange_DataFrameGroupBy(grp, column_spec, kind="quicksort", na_position="la
 
 @register_verb("sort_values", types=DataFrameGroupBy)
 def sort_values_DataFrameGroupBy(
-    grp, column_spec, kind="quicksort", na_position="last"
+    grp, column_spec, kind="quicksort", na_position="last", by_group_codes=False
 ):
     """Alias for arrange for groupby-objects"""
-    return arrange_DataFrameGroupBy(grp, column_spec, kind, na_position)
+    return arrange_DataFrameGroupBy(grp, column_spec, kind, na_position, by_group_codes)
+
+
+def _slice_candidates(codes, ngroups, values, n, ascending):
+    """Positions of the rows that may be among the first n of their group when
+    sorted by values - a partial selection (n rounds of per group minima,
+    or np.partition per group for larger n) instead of sorting the values.
+    Ties and missing values are kept if they might be needed."""
+    keys = -values if not ascending else values.copy()
+    keys[np.isnan(keys)] = np.inf  # sorted last
+    # counting sort by group code (stable, O(n)) - missing keys (-1) come first
+    positions = get_group_index_sorter(codes.astype(np.intp), ngroups)
+    positions = positions[(codes < 0).sum() :]
+    seg_codes = codes[positions]
+    seg_keys = keys[positions]
+    counts = np.bincount(seg_codes, minlength=ngroups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    thresholds = np.full(ngroups, np.inf)
+    present = counts > 0
+    if n <= 16:
+        # the n-th smallest key per group, one distinct value per round
+        previous = np.full(ngroups, -np.inf)
+        found = np.zeros(ngroups)
+        for _ in range(n):
+            remaining = np.where(seg_keys > previous[seg_codes], seg_keys, np.inf)
+            smallest = np.full(ngroups, np.inf)
+            smallest[present] = np.minimum.reduceat(remaining, starts[present])
+            found += np.bincount(
+                seg_codes, weights=remaining == smallest[seg_codes], minlength=ngroups
+            )
+            reached = (found >= n) & (thresholds == np.inf)
+            thresholds[reached] = smallest[reached]
+            previous = smallest
+    else:
+        for g in np.flatnonzero(counts > n):
+            segment = seg_keys[starts[g] : starts[g] + counts[g]]
+            thresholds[g] = np.partition(segment, n - 1)[n - 1]
+    return positions[seg_keys <= thresholds[seg_codes]]
 
 
-@register_verb("natsort", types=pd.DataFrame)
-def natsort_DataFrame(df, column):
-    from natsort import order_by_index, index_natsorted
+def _slice_extreme(obj, column_spec, n, largest):
+    """Shared implementation of slice_max / slice_min"""
+    if isinstance(obj, pd.DataFrame):
+        df = obj
+    else:
+        df = obj._selected_obj
+    cols_plus_inversed = parse_column_specification(df, column_spec, return_list=2)
+    if not cols_plus_inversed:
+        raise ValueError("No columns passed spec - don't know how to sort")
+    columns = [x[0] for x in cols_plus_inversed]
+    ascending = [x[1] == largest for x in cols_plus_inversed]
+    numeric = [
+        pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])
+        for c in columns
+    ]
+    if isinstance(obj, pd.DataFrame):
+        if len(set(ascending)) == 1 and all(numeric):
+            if ascending[0]:
+                result = df.nsmallest(n, columns)
+            else:
+                result = df.nlargest(n, columns)
+            if len(result) == min(n, len(df)):  # otherwise NaNs were dropped
+                return result
+        return df.sort_values(columns, ascending=ascending, kind="mergesort").head(n)
+    if n < 1:
+        return df.iloc[:0].groupby(**group_extract_params(obj))
+    codes = obj.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    if numeric[0]:
+        values = df[columns[0]].to_numpy(dtype=np.float64, na_value=np.nan)
+        candidates = _slice_candidates(codes, obj.ngroups, values, n, ascending[0])
+    else:
+        candidates = np.flatnonzero(codes >= 0)
+    sort_columns = {c: df[c].iloc[candidates] for c in columns}
+    order = candidates[
+        _group_sort_order(codes[candidates], sort_columns, columns, ascending, "last")
+    ]
+    sorted_codes = codes[order]
+    group_starts = np.zeros(len(order), dtype=np.int64)
+    boundaries = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+    group_starts[boundaries] = boundaries
+    group_starts = np.maximum.accumulate(group_starts)
+    rank_in_group = np.arange(len(order)) - group_starts
+    positions = order[rank_in_group < n]
+    return regroup_rows(obj, df.iloc[positions], positions)
+
+
+@register_verb("slice_max", types=[pd.DataFrame, DataFrameGroupBy])
+def slice_max(obj, column_spec, n=1):
+    """Verb: the n rows (per group) with the largest values.
+
+    Like arrange(column_spec).head(n), without sorting all rows by value:
+    for DataFrames this uses :meth:`pandas.DataFrame.nlargest`. For groups,
+    the rows are bucketed by their integer group codes (counting sort),
+    the candidates for each group's first n are picked by a partial selection
+    on the first column of the spec (if numeric), and only those are sorted.
+
+    Parameters
+    ----------
+        column_spec : column specification
+            see :func:`dppd.single_verbs.parse_column_specification`.
+            '-column' selects the smallest values of that column instead.
+        n : int
+            rows to keep (per group). Ties are broken by row order.
+    """
+    return _slice_extreme(obj, column_spec, n, True)
+
+
+@register_verb("slice_min", types=[pd.DataFrame, DataFrameGroupBy])
+def slice_min(obj, column_spec, n=1):
+    """Verb: the n rows (per group) with the smallest values.
+
+    See :func:`slice_max`, '-column' selects the largest values of that column.
+    """
+    return _slice_extreme(obj, column_spec, n, False)
 
-    return df.reindex(index=order_by_index(df.index, index_natsorted(df[column])))
 
+@register_verb("top_n", types=[pd.DataFrame, DataFrameGroupBy])
+def top_n(obj, n, column_spec):
+    """Verb: dplyr's top_n - slice_max(column_spec, n), or slice_min(column_spec, -n)
+    for negative n"""
+    if n < 0:
+        return slice_min(obj, column_spec, -n)
+    return slice_max(obj, column_spec, n)
 
-@register_verb(["astype", "as_type"], types=pd.DataFrame)
+
+@register_verb("natsort", types=pd.DataFrame, pure=True)
+def natsort_DataFrame(df, column):
+    return df.reindex(
+        index=natsort.order_by_index(df.index, natsort.index_natsorted(df[column]))
+    )
+
+
+@register_verb(["astype", "as_type"], types=pd.DataFrame, pure=True)
 def astype_DataFrame(df, columns, dtype, **kwargs):
     columns = parse_column_specification(df, columns, return_list=True)
     return df.assign(**{x: df[x].astype(dtype, **kwargs) for x in columns})
@@ -865,26 +1418,52 @@ def unique_in_order(seq):
     return [x for x in seq if not (x in seen or seen_add(x))]
 
 
-@register_verb("categorize", types=pd.DataFrame)
-def categorize_DataFrame(df, columns=None, categories=use_df_order, ordered=None):
+def _factorize_in_order(series):
+    """codes & uniques (in order of first occurrence, without NaN) in one hashing pass"""
+    codes, uniques = pd.factorize(series)
+    if isinstance(uniques, pd.CategoricalIndex):
+        uniques = uniques.categories.take(uniques.codes)
+    return codes, uniques
+
+
+def _categorize_column(series, categories, ordered):
+    if categories is use_df_order:
+        codes, uniques = _factorize_in_order(series)
+        return pd.Categorical.from_codes(codes, uniques, ordered)
+    elif isinstance(categories, str) and categories in ("natsorted", "natsort"):
+        codes, uniques = _factorize_in_order(series)
+        order = np.array(natsort.index_natsorted(uniques), dtype=np.int64)
+        new_codes = np.empty(len(order), dtype=codes.dtype)
+        new_codes[order] = np.arange(len(order))
+        codes = np.where(codes >= 0, new_codes[np.maximum(codes, 0)], -1)
+        return pd.Categorical.from_codes(codes, uniques.take(order), ordered)
+    else:
+        return pd.Categorical(series, categories, ordered)
+
+
+@register_verb("categorize", types=pd.DataFrame, pure=True)
+def categorize_DataFrame(
+    df, columns=None, categories=use_df_order, ordered=None, n_jobs=1
+):
     """Turn columns into pandas.Categorical.
     By default, they get ordered by their occurrences in the column.
     You can pass False, then pd.Categorical will sort alphabetically,
     or 'natsorted', in which case they'll be passed through natsort.natsorted
+
+    Missing values never become a category.
+    n_jobs > 1 categorizes that many columns in parallel (threads).
     """
     columns = parse_column_specification(df, columns, return_list=True)
-    if categories is use_df_order:
-        new = {}
-        for c in columns:
-            new[c] = pd.Categorical(df[c], unique_in_order(df[c]), ordered)
-    elif isinstance(categories, str) and categories in ("natsorted", "natsort"):
-        import natsort
+    if n_jobs > 1 and len(columns) > 1:
+        from concurrent.futures import ThreadPoolExecutor
 
-        new = {}
-        for c in columns:
-            new[c] = pd.Categorical(df[c], natsort.natsorted(df[c].unique()), ordered)
+        with ThreadPoolExecutor(n_jobs) as pool:
+            converted = pool.map(
+                lambda c: _categorize_column(df[c], categories, ordered), columns
+            )
+            new = dict(zip(columns, converted))
     else:
-        new = {c: pd.Categorical(df[c], categories, ordered) for c in columns}
+        new = {c: _categorize_column(df[c], categories, ordered) for c in columns}
 
     df = mutate_DataFrame(df, **new)
     return df
@@ -893,7 +1472,9 @@ def categorize_DataFrame(df, columns=None, categories=use_df_order, ordered=None
 @register_verb(["reset_columns", "rename_columns"], types=pd.DataFrame)
 def reset_columns_DataFrame(df, new_columns=None):
     """
-    Rename *all* columns in a dataframe (and return a copy).
+    Rename *all* columns in a dataframe (and return a shallow copy - df's
+    columns are not modified, but like select's result it shares df's values,
+    so writing to them writes through unless pandas' copy_on_write is on).
     Possible new_columns values:
 
     - None: df.columns = list(df.columns)
@@ -906,6 +1487,7 @@ def reset_columns_DataFrame(df, new_columns=None):
     now can no longer assign columns.  (Arguably a pandas bug)
 
     """
+    df = df.copy(deep=False)
     if new_columns is None:
         df.columns = list(df.columns)
     elif isinstance(new_columns, list) or isinstance(new_columns, pd.MultiIndex):
@@ -927,25 +1509,80 @@ def ends(df, n=5):
     return df.iloc[np.r_[0:n, -n:0]]  # noqa: E213
 
 
-@register_verb("binarize", types=pd.DataFrame)
-def binarize(df, col_spec, drop=True):
+def _binarize_sparse_matrix(df, cols):
+    """One scipy.sparse.csc_matrix of indicator columns for all cols,
+    build straight from the categorical codes"""
+    row_parts = []
+    column_parts = []
+    names = []
+    for c in cols:
+        codes = df[c].cat.codes.to_numpy()
+        present = codes >= 0
+        row_parts.append(np.flatnonzero(present))
+        column_parts.append(codes[present].astype(np.int64) + len(names))
+        names.extend(["%s-%s" % (c, ll) for ll in df[c].cat.categories])
+    rows = np.concatenate(row_parts) if row_parts else np.zeros(0, int)
+    columns = np.concatenate(column_parts) if column_parts else np.zeros(0, int)
+    matrix = scipy_sparse.csc_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, columns)),
+        shape=(len(df), len(names)),
+    )
+    return matrix, names
+
+
+@register_verb("binarize", types=pd.DataFrame, pure=True)
+def binarize(df, col_spec, drop=True, sparse=False):
     """Convert categorical columns into
     'regression columns', i.e. X with values a,b,c becomes
     three binary columns X-a, X-b, X-c which are True exactly
     where X was a, etc.
+
+    The indicators are build from the categorical codes in one vectorized pass.
+
+    Parameters
+    ----------
+    sparse : bool or 'scipy'
+        * False - dense bool columns
+        * True - pandas SparseDtype(bool) columns (requires scipy)
+        * 'scipy' - return a tuple (scipy.sparse.csr_matrix, column_names) of just the
+          indicator columns, for direct use in model fitting. ``drop`` is ignored.
     """
     cols = parse_column_specification(df, col_spec, return_list=True)
+    if sparse == "scipy":
+        matrix, names = _binarize_sparse_matrix(df, cols)
+        return matrix.tocsr(), names
+    elif sparse:
+        matrix, names = _binarize_sparse_matrix(df, cols)
+        # pandas < 3 hard codes fill_value 0 in from_spmatrix, which is deprecated
+        # for bool - build uint8 columns and only convert their sp_values
+        indicators = pd.DataFrame.sparse.from_spmatrix(
+            matrix.astype(np.uint8), index=df.index, columns=names
+        )
+        dtype = pd.SparseDtype(bool, False)
+        indicators = pd.DataFrame(
+            {
+                name: indicators.iloc[:, ii].array.astype(dtype)
+                for ii, name in enumerate(names)
+            },
+            index=df.index,
+        )
+        out = [indicators]
+    else:
+        out = []
+        for c in cols:
+            levels = df[c].cat.categories
+            codes = df[c].cat.codes.to_numpy()
+            out.append(
+                pd.DataFrame(
+                    codes[:, None] == np.arange(len(levels)),
+                    index=df.index,
+                    columns=["%s-%s" % (c, ll) for ll in levels],
+                )
+            )
     if drop:
-        out = [df.drop(cols, axis=1)]
+        out.insert(0, df.drop(cols, axis=1))
     else:
-        out = [df]
-    for c in cols:
-        levels = df[c].cat.categories
-        here = {}
-        for ll in levels:
-            name = "%s-%s" % (c, ll)
-            here[name] = df[c] == ll
-        out.append(pd.DataFrame(here))
+        out.insert(0, df)
     return pd.concat(out, axis=1)
 
 
@@ -956,42 +1593,317 @@ def to_frame_dict(d, **kwargs):
     return pd.DataFrame.from_dict(d, **kwargs)
 
 
+def _float_dtype(df, dtype, out=None):
+    if dtype is not None:
+        return np.dtype(dtype)
+    if out is not None:
+        return out.dtype
+    dtypes = set(df.dtypes)
+    if len(dtypes) == 1:
+        dt = dtypes.pop()
+        if isinstance(dt, np.dtype) and dt.kind == "f":
+            return dt
+    return np.dtype(np.float64)
+
+
+def _output_array(df, dtype, inplace, out):
+    """Where to write the transformed values of df: out, df's own
+    block (inplace), or a new array"""
+    if inplace:
+        if out is not None:
+            raise ValueError("Pass either inplace or out, not both")
+        values = df.to_numpy(copy=False)
+        if (
+            len(df._mgr.blocks) != 1
+            or values.dtype != dtype
+            or not values.flags.writeable
+        ):
+            raise ValueError(
+                f"inplace requires a DataFrame consisting of one writeable {dtype} block"
+            )
+        return values
+    elif out is not None:
+        if out.shape != df.shape or out.dtype != dtype:
+            raise ValueError(
+                f"out must have shape {df.shape} and dtype {dtype}, "
+                f"was {out.shape} {out.dtype}"
+            )
+        return out
+    else:
+        return np.empty(df.shape, dtype=dtype, order="F")
+
+
+def _row_chunks(df, dtype, chunk_size):
+    """Yield (start, stop, values) row blocks of df as dtype arrays"""
+    if chunk_size is None:
+        chunk_size = max(len(df), 1)
+    elif chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    for start in range(0, len(df), chunk_size):
+        stop = min(start + chunk_size, len(df))
+        yield start, stop, df.iloc[start:stop].to_numpy(dtype=dtype, copy=False)
+
+
+def _result_frame(df, values, inplace, keep_nan, nan_rows):
+    if inplace:
+        result = df
+    else:
+        result = pd.DataFrame(values, index=df.index, columns=df.columns, copy=False)
+    if not keep_nan and nan_rows.any():
+        result = result[~nan_rows]
+    return result
+
+
 @register_verb("norm_0_to_1", types=pd.DataFrame)
-def norm_0_to_1(df, axis=1, keep_nan=False):
+def norm_0_to_1(
+    df, axis=1, keep_nan=False, dtype=None, inplace=False, out=None, chunk_size=None
+):
     """Normalize a (numeric) data frame so that
     it goes from 0 to 1 in each row (axis=1) or column (axis=0)
     Usefully for PCA, correlation, etc. because then
-    the dimensions are comparable in size"""
-    if axis == 1:
-        a1 = 1
-        a2 = 0
-    else:
-        a1 = 0
-        a2 = 1
-    df_normed = df.sub(df.min(axis=a1), axis=a2)
-    assert df_normed.min().min() == 0.0
-    df_normed = df_normed.div(df_normed.max(axis=a1), axis=a2)
-    assert df_normed.max().max() == 1.0
-    if not keep_nan:
-        df_normed = df_normed[~pd.isnull(df_normed).any(axis=1)]
-    return df_normed
+    the dimensions are comparable in size.
+
+    Works on the underlying numpy array, without intermediate
+    frames. Constant rows (columns) become NaN.
+
+    Parameters
+    ----------
+        axis : int
+            1 - normalize each row, 0 - normalize each column
+        keep_nan : bool
+            if False, rows containing NaN (after normalization) are dropped
+        dtype : numpy float dtype or None
+            result dtype, e.g. np.float32. Default: out's dtype, the frame's
+            float dtype, or float64
+        inplace : bool
+            overwrite the values of df (which must consist of a single
+            float block of dtype)
+        out : np.ndarray or None
+            write the result into this preallocated array of shape df.shape
+            (the returned DataFrame is backed by it)
+        chunk_size : int or None
+            process this many rows at a time - limits the temporary memory to
+            one chunk (plus the output) for frames with mixed column dtypes.
+            axis=0 then takes two passes over the data
+    """
+    if axis not in (0, 1):
+        raise ValueError("axis must be 0 or 1")
+    dtype = _float_dtype(df, dtype, out)
+    values = _output_array(df, dtype, inplace, out)
+    nan_rows = np.zeros(len(df), dtype=bool)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # all NaN rows/columns
+        if axis == 0:
+            lower = np.full(df.shape[1], np.nan, dtype=dtype)
+            upper = np.full(df.shape[1], np.nan, dtype=dtype)
+            for start, stop, chunk in _row_chunks(df, dtype, chunk_size):
+                np.fmin(lower, np.nanmin(chunk, axis=0), out=lower)
+                np.fmax(upper, np.nanmax(chunk, axis=0), out=upper)
+            span = upper - lower
+        for start, stop, chunk in _row_chunks(df, dtype, chunk_size):
+            target = values[start:stop]
+            if axis == 1:
+                lower = np.nanmin(chunk, axis=1)[:, None]
+                span = np.nanmax(chunk, axis=1)[:, None] - lower
+            np.subtract(chunk, lower, out=target)
+            np.divide(target, span, out=target)
+            if not keep_nan:
+                nan_rows[start:stop] = np.isnan(target).any(axis=1)
+    return _result_frame(df, values, inplace, keep_nan, nan_rows)
+
+
+def _apply_log(df, ufunc, base, pseudocount, keep_non_numeric, dtype, inplace, out):
+    """Apply ufunc (and the base change) once to the consolidated
+    numeric columns of df"""
+    is_numeric = np.array(
+        [
+            pd.api.types.is_numeric_dtype(dt) and not pd.api.types.is_bool_dtype(dt)
+            for dt in df.dtypes
+        ],
+        dtype=bool,
+    )
+    numeric = df.iloc[:, np.flatnonzero(is_numeric)] if not is_numeric.all() else df
+    if inplace and numeric is not df:
+        raise ValueError("inplace requires an all numeric DataFrame")
+    dtype = _float_dtype(numeric, dtype, out)
+    values = _output_array(numeric, dtype, inplace, out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        source = numeric.to_numpy(dtype=dtype, copy=False, na_value=np.nan)
+        if pseudocount:
+            source = np.add(source, pseudocount, out=values)
+        ufunc(source, out=values)
+        if base is not None:
+            np.divide(values, np.log(base), out=values)
+    if inplace:
+        return df
+    result = pd.DataFrame(values, index=df.index, columns=numeric.columns, copy=False)
+    if keep_non_numeric and numeric is not df:
+        # insert the untouched columns at their original positions,
+        # instead of copying the numeric block into a new frame
+        for pos in np.flatnonzero(~is_numeric):
+            result.insert(
+                int(pos), df.columns[pos], df.iloc[:, pos], allow_duplicates=True
+            )
+    return result
 
 
 @register_verb("log2", types=pd.DataFrame)
-def log2(df):
-    df = df.select_dtypes(np.number)
-    res = {c: np.log2(df[c]) for c in df.columns}
-    return pd.DataFrame(res, index=df.index)
+def log2(
+    df, pseudocount=0, keep_non_numeric=False, dtype=None, inplace=False, out=None
+):
+    """Verb: log2 of all numeric columns.
 
+    Parameters
+    ----------
+        pseudocount : number
+            added before taking the logarithm (log2(x + pseudocount))
+        keep_non_numeric : bool
+            keep the non numeric columns (unchanged, in place).
+            Default is to drop them
+        dtype : numpy float dtype or None
+            result dtype, e.g. np.float32. Default: out's dtype, the
+            columns' float dtype, or float64
+        inplace : bool
+            overwrite the values of df (which must consist of a single float
+            block of dtype)
+        out : np.ndarray or None
+            write the result into this preallocated array
+            of shape (len(df), number of numeric columns)
+    """
+    return _apply_log(
+        df, np.log2, None, pseudocount, keep_non_numeric, dtype, inplace, out
+    )
 
-@register_verb("zscore", types=pd.DataFrame)
-def norm_zscore(df, axis=1):
-    """apply zcore transform (X - mu) / std via scipy.stats.zcore an the given axis"""
-    import scipy.stats
 
-    return pd.DataFrame(
-        scipy.stats.zscore(df, axis=1), columns=df.columns, index=df.index
+@register_verb("log", types=pd.DataFrame)
+def log(
+    df,
+    base=None,
+    pseudocount=0,
+    keep_non_numeric=False,
+    dtype=None,
+    inplace=False,
+    out=None,
+):
+    """Verb: logarithm of all numeric columns, to base (default: e)
+
+    See :func:`log2` for the other parameters.
+    """
+    if base == 2:
+        return log2(df, pseudocount, keep_non_numeric, dtype, inplace, out)
+    elif base == 10:
+        ufunc, base = np.log10, None
+    else:
+        ufunc = np.log
+    return _apply_log(
+        df, ufunc, base, pseudocount, keep_non_numeric, dtype, inplace, out
+    )
+
+
+@register_verb("log1p", types=pd.DataFrame)
+def log1p(df, keep_non_numeric=False, dtype=None, inplace=False, out=None):
+    """Verb: natural logarithm of 1 + x of all numeric columns (precise for small x).
+
+    See :func:`log2` for the parameters.
+    """
+    return _apply_log(df, np.log1p, None, 0, keep_non_numeric, dtype, inplace, out)
+
+
+def _moments(chunk, axis, omit, deviations=None):
+    """count, mean and sum of squared deviations of chunk along axis (float64).
+
+    The deviations from the mean are written to deviations (default: a new array)
+    and returned as the fourth value.
+    """
+    if omit:
+        count = (~np.isnan(chunk)).sum(axis=axis)
+        mean = np.nansum(chunk, axis=axis, dtype=np.float64) / count
+    else:
+        count = np.full(chunk.shape[1 - axis], chunk.shape[axis])
+        mean = np.sum(chunk, axis=axis, dtype=np.float64) / count
+    deviations = np.subtract(
+        chunk, np.expand_dims(mean, axis).astype(chunk.dtype), out=deviations
     )
+    if omit:
+        m2 = np.nansum(np.square(deviations), axis=axis, dtype=np.float64)
+    else:
+        m2 = np.einsum(
+            "ij,ij->i" if axis == 1 else "ij,ij->j",
+            deviations,
+            deviations,
+            dtype=np.float64,
+        )
+    return count, mean, m2, deviations
+
+
+@register_verb("zscore", types=pd.DataFrame)
+def norm_zscore(
+    df,
+    axis=1,
+    ddof=0,
+    nan_policy="propagate",
+    dtype=None,
+    inplace=False,
+    out=None,
+    chunk_size=None,
+):
+    """apply zscore transform (X - mu) / std along the given axis
+    (1: per row, 0: per column), like scipy.stats.zscore.
+
+    Parameters
+    ----------
+        axis : int
+            1 - standardize each row, 0 - standardize each column
+        ddof : int
+            degrees of freedom correction for the standard deviation
+        nan_policy : str
+            'propagate' - rows (columns) containing NaN become NaN,
+            'omit' - NaNs are ignored when computing mean and std (and stay NaN),
+            'raise' - raise ValueError on NaN
+        dtype, inplace, out, chunk_size :
+            see :func:`norm_0_to_1`. axis=0 takes two passes over the data,
+            one accumulating the column moments chunk by chunk, one transforming
+    """
+    if axis not in (0, 1):
+        raise ValueError("axis must be 0 or 1")
+    if nan_policy not in ("propagate", "omit", "raise"):
+        raise ValueError("nan_policy must be one of 'propagate', 'omit', 'raise'")
+    omit = nan_policy == "omit"
+    dtype = _float_dtype(df, dtype, out)
+    values = _output_array(df, dtype, inplace, out)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # all NaN rows/columns
+        if axis == 0:
+            count = np.zeros(df.shape[1])
+            mean = np.zeros(df.shape[1])
+            m2 = np.zeros(df.shape[1])
+            for start, stop, chunk in _row_chunks(df, dtype, chunk_size):
+                if nan_policy == "raise" and np.isnan(chunk).any():
+                    raise ValueError("The input contains nan values")
+                # merge the chunk's moments into the running ones (Chan et al.)
+                c_count, c_mean, c_m2, _ = _moments(chunk, 0, omit)
+                total = count + c_count
+                delta = c_mean - mean
+                mean = np.where(c_count > 0, mean + delta * (c_count / total), mean)
+                m2 = np.where(
+                    c_count > 0,
+                    m2 + c_m2 + delta * delta * (count * c_count / total),
+                    m2,
+                )
+                count = total
+            mean = np.where(count > 0, mean, np.nan).astype(dtype)
+            std = np.sqrt(m2 / (count - ddof)).astype(dtype)
+        for start, stop, chunk in _row_chunks(df, dtype, chunk_size):
+            if axis == 1:
+                if nan_policy == "raise" and np.isnan(chunk).any():
+                    raise ValueError("The input contains nan values")
+                # the deviations go straight into the output
+                count, _, m2, target = _moments(chunk, 1, omit, values[start:stop])
+                std = np.sqrt(m2 / (count - ddof)).astype(dtype)[:, None]
+            else:
+                target = np.subtract(chunk, mean, out=values[start:stop])
+            np.divide(target, std, out=target)
+    return _result_frame(df, values, inplace, True, None)
 
 
 @register_verb("colspec", types=pd.DataFrame)
@@ -1011,17 +1923,60 @@ def colspec_DataFrame(df, columns, invert=False):
 
 
 @register_verb("pca", types=pd.DataFrame)
-def pca_dataframe(df, whiten=False, random_state=None, n_components=2):
+def pca_dataframe(
+    df,
+    whiten=False,
+    random_state=None,
+    n_components=2,
+    svd_solver="auto",
+    batch_size=None,
+    dtype=None,
+):
     """Perform 2 component PCA using sklearn.decomposition.PCA.
     Expects samples in rows!
     Returns a tuple (DataFrame{sample, 1st, 2nd},
     whith an additiona l, explained_variance_ratio_ attribute
-    """
-    from sklearn.decomposition import PCA
-    import warnings
 
-    p = PCA(n_components=n_components, whiten=whiten, random_state=random_state)
-    df_fit = pd.DataFrame(p.fit_transform(df))
+    Parameters
+    ----------
+        svd_solver : str
+            passed to sklearn.decomposition.PCA - 'randomized' is much
+            faster for large matrices and few components
+        batch_size : int or None
+            if set, use sklearn.decomposition.IncrementalPCA, fed with
+            row chunks of this size (converted from the DataFrame one
+            at a time), for matrices that don't fit in memory twice
+        dtype : numpy float dtype or None
+            the dtype the PCA runs in. Default: the frame's float dtype
+            (so float32 is not upcast), or float64
+    """
+    dtype = _float_dtype(df, dtype)
+    if batch_size is None:
+        p = sklearn_decomposition.PCA(
+            n_components=n_components,
+            whiten=whiten,
+            random_state=random_state,
+            svd_solver=svd_solver,
+        )
+        fitted = p.fit_transform(df.to_numpy(dtype=dtype, copy=False))
+    else:
+        if svd_solver != "auto":
+            raise ValueError("svd_solver is not supported with batch_size")
+        p = sklearn_decomposition.IncrementalPCA(
+            n_components=n_components, whiten=whiten, batch_size=batch_size
+        )
+        # every batch needs at least n_components rows
+        batches = list(
+            sklearn_utils.gen_batches(len(df), batch_size, min_batch_size=n_components)
+        )
+        for batch in batches:
+            p.partial_fit(df.iloc[batch].to_numpy(dtype=dtype, copy=False))
+        fitted = np.empty((len(df), n_components), dtype=dtype)
+        for batch in batches:
+            fitted[batch] = p.transform(
+                df.iloc[batch].to_numpy(dtype=dtype, copy=False)
+            )
+    df_fit = pd.DataFrame(fitted)
     cols = ["1st", "2nd"]
     if n_components > 2:
         cols.append("3rd")
@@ -1039,6 +1994,9 @@ def pca_dataframe(df, whiten=False, random_state=None, n_components=2):
 
 @register_verb("insert", types=pd.DataFrame, ignore_redefine=True)
 def insert_return_self(df, loc, column, value, **kwargs):
-    """DataFrame.insert, but return self."""
+    """DataFrame.insert, but return the result (a shallow copy - df's columns
+    are not modified, writing to the other values writes through to df unless
+    pandas' copy_on_write is on, like select's result)."""
+    df = df.copy(deep=False)
     df.insert(loc, column, value, **kwargs)
     return df
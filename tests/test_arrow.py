@@ -0,0 +1,90 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pandas.testing
+from plotnine.data import mtcars
+from dppd import dppd, options, option_context
+
+pa = pytest.importorskip("pyarrow")
+assert_frame_equal = pandas.testing.assert_frame_equal
+dp, X = dppd()
+arrow_string = pd.ArrowDtype(pa.string())
+
+
+def test_option_context():
+    assert options["arrow"] is False
+    with option_context(arrow=True) as opts:
+        assert opts["arrow"] is True
+        assert options["arrow"] is True
+    assert options["arrow"] is False
+    with pytest.raises(KeyError):
+        option_context(no_such_option=True)
+
+
+def test_dp_converts_object_columns():
+    df = pd.DataFrame({"s": ["a", None, "c"], "i": [1, 2, 3], "m": ["a", 1, None]})
+    with option_context(arrow=True):
+        actual = dp(df).pd
+        assert actual["s"].dtype == arrow_string
+        assert actual["i"].dtype == np.int64
+        assert actual["m"].dtype == object  # mixed, can't be converted
+        actual = dppd(df).dppd.df
+        assert actual["s"].dtype == arrow_string
+    assert df["s"].dtype == object
+    assert dp(df).pd["s"].dtype == object
+
+
+def test_unite_arrow():
+    should = dp(mtcars).unite(["name", "cyl"], "-").pd
+    with option_context(arrow=True):
+        actual = dp(mtcars).unite(["name", "cyl"], "-").pd
+    assert actual.dtype == arrow_string
+    assert list(actual) == list(should)
+    assert (actual.index == should.index).all()
+
+
+def test_seperate_arrow_option():
+    df = pd.DataFrame({"X": [None, "a.b", "a.d", "b.c"]})
+    with option_context(arrow=True):
+        actual = dp(df).seperate("X", ["A", "B"]).pd
+    assert actual["A"].dtype == arrow_string
+    assert actual["A"].isnull().iloc[0]
+    assert list(actual["B"].iloc[1:]) == ["b", "d", "c"]
+
+
+def test_gather_arrow_key():
+    df = mtcars[["name", "hp", "cyl"]]
+    should = dp(df).gather("variable", "value", "-name").pd
+    with option_context(arrow=True):
+        actual = dp(df).gather("variable", "value", "-name").pd
+        blocks = list(dp(df).gather("variable", "value", "-name", chunk_size=1))
+        categorical = (
+            dp(df).gather("variable", "value", "-name", categorical_key=True).pd
+        )
+    assert actual["variable"].dtype == arrow_string
+    assert actual["name"].dtype == arrow_string
+    assert_frame_equal(should, actual.astype({"variable": object, "name": object}))
+    assert blocks[0]["variable"].dtype == arrow_string
+    assert isinstance(categorical["variable"].dtype, pd.CategoricalDtype)
+
+
+def test_grouped_mutate_series_broadcast_arrow():
+    df = pd.DataFrame({"g": ["a", "b", "a", None, "b"], "v": range(5)})
+    per_group = pd.Series({"a": "first", "b": "second"})
+    should = dp(df).groupby("g").mutate(label=per_group).ungroup().pd
+    with option_context(arrow=True):
+        actual = (
+            dp(df.astype({"g": object}))
+            .groupby("g")
+            .mutate(label=per_group)
+            .ungroup()
+            .pd
+        )
+        numbers = dp(df).groupby("g").mutate(n=pd.Series({"a": 1, "b": 2})).ungroup().pd
+    assert should["label"].dtype == object
+    assert actual["label"].dtype == arrow_string
+    assert list(actual["label"].iloc[[0, 1, 2, 4]]) == list(
+        should["label"].iloc[[0, 1, 2, 4]]
+    )
+    assert actual["label"].isnull().iloc[3]
+    assert list(numbers["n"].iloc[[0, 1, 2, 4]]) == [1, 2, 1, 2]
@@ -350,3 +350,60 @@ def test_version_is_correct():
         assert version == org_dppd.__version__
     except ImportError:
         pass # python < 3.11
+
+
+def test_forwarded_verbs():
+    from dppd.base import forwarded_verbs, register_pending_type_methods
+
+    register_pending_type_methods()
+    forwarded = forwarded_verbs[pd.DataFrame]
+    assert "head" in forwarded
+    assert "select" not in forwarded  # excluded
+    assert "mutate" not in forwarded  # not a DataFrame method
+    assert "insert" not in forwarded  # replaced by a dppd verb
+    assert "transform" in forwarded_verbs[pd.core.groupby.DataFrameGroupBy]
+
+
+def test_forwarded_verbs_are_registered_lazily():
+    from dppd.base import (
+        register_type_methods_as_verbs,
+        verb_registry,
+        property_registry,
+        forwarded_verbs,
+    )
+
+    class LazyDemo:
+        a_property = 5
+
+        def shout(self):
+            return "A"
+
+        def update(self):
+            return "forwarded"
+
+        def keep(self):
+            return self
+
+    register_type_methods_as_verbs(LazyDemo, ["keep"])
+
+    @register_verb("update", types=LazyDemo)
+    def update(obj):
+        return "verb"
+
+    assert ("shout", LazyDemo) not in verb_registry
+    dp, X = dppd()
+    assert dp(LazyDemo()).shout() == "A"
+    assert ("shout", LazyDemo) in verb_registry
+    assert "shout" in forwarded_verbs[LazyDemo]
+    assert dp(LazyDemo()).update() == "verb"  # register_verb wins
+    assert "update" not in forwarded_verbs[LazyDemo]
+    with pytest.raises(AttributeError):
+        dp(LazyDemo()).keep
+    with pytest.raises(AttributeError):
+        dp(LazyDemo()).no_such_thing
+    assert "a_property" not in property_registry[LazyDemo]
+    names = dir(dp(LazyDemo()))
+    assert "a_property" in names
+    assert "shout" in names
+    assert "keep" not in names
+    assert dp(LazyDemo()).a_property.pd == 5
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pandas.testing
+import pytest
+from dppd import dppd
+
+assert_frame_equal = pandas.testing.assert_frame_equal
+dp, X = dppd()
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "a": np.arange(10, dtype=float),
+            "b": np.arange(10),
+            "g": ["x", "y"] * 5,
+        }
+    )
+
+
+def _shares(left, right, column):
+    return np.shares_memory(left[column].to_numpy(), right[column].to_numpy())
+
+
+verbs = [
+    lambda d: d.select(["a", "b"]),
+    lambda d: d.unselect(["g"]),
+    lambda d: d.mutate(c=lambda df: df["a"] * 2),
+    lambda d: d.mutate(a=0),
+    lambda d: d.groupby("g").mutate(c=lambda df: df["a"] * 2).ungroup(),
+    lambda d: d.groupby("g").mutate(b=0).ungroup(),
+    lambda d: d.reset_columns(["x", "y", "z"]),
+    lambda d: d.reset_columns(str.upper),
+    lambda d: d.insert(0, "c", 1),
+    lambda d: d.astype("b", float),
+    lambda d: d.arrange("b"),
+    lambda d: d.categorize("g"),
+    lambda d: d.log2(pseudocount=1, keep_non_numeric=True),
+    lambda d: d.groupby("g").do(lambda df: df.head(1)),
+    lambda d: d.groupby("g").summarize(("a", np.sum)),
+    lambda d: d.gather("variable", "value", ["a", "b"]),
+    lambda d: d.unite(["g", "b"]),
+]
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+@pytest.mark.parametrize("verb", range(len(verbs)))
+def test_verbs_do_not_modify_their_input(verb, copy_on_write):
+    with pd.option_context("mode.copy_on_write", copy_on_write):
+        df = _frame()
+        columns = df.columns
+        verbs[verb](dp(df)).pd
+        assert df.columns is columns
+        assert_frame_equal(df, _frame())
+
+
+@pytest.mark.parametrize(
+    "verb, kept",
+    [
+        (lambda d: d.select(["a", "b"]), ["a", "b"]),
+        (lambda d: d.unselect(["g"]), ["a", "b"]),
+        (lambda d: d.mutate(c=lambda df: df["a"] * 2), ["a", "b"]),
+        (lambda d: d.mutate(a=0), ["b"]),
+        (lambda d: d.groupby("g").mutate(c=1).ungroup(), ["a", "b"]),
+        (lambda d: d.insert(0, "c", 1), ["a", "b"]),
+        (lambda d: d.reset_columns(["a", "b", "g"]), ["a", "b"]),
+        (lambda d: d.seperate("g", ["h"]), ["a", "b"]),
+        (lambda d: d.astype("b", float), ["a"]),
+        (lambda d: d.filter_by(X.b >= 0), []),
+    ],
+)
+def test_verbs_share_buffers_under_copy_on_write(verb, kept):
+    with pd.option_context("mode.copy_on_write", True):
+        df = _frame()
+        actual = verb(dp(df)).pd
+        for column in kept:
+            assert _shares(df, actual, column), column
+        # and writing to the result does not write through
+        for column in kept:
+            actual.loc[0, column] = -1
+        assert_frame_equal(df, _frame())
+
+
+def test_reset_columns_shares_buffers_under_copy_on_write():
+    with pd.option_context("mode.copy_on_write", True):
+        df = _frame()
+        actual = dp(df).reset_columns(["x", "y", "z"]).pd
+        assert list(df.columns) == ["a", "b", "g"]
+        assert np.shares_memory(df["a"].to_numpy(), actual["x"].to_numpy())
+        assert np.shares_memory(df["b"].to_numpy(), actual["y"].to_numpy())
+
+
+@pytest.mark.parametrize(
+    "verb",
+    [
+        lambda d: d.mutate(c=1),
+        lambda d: d.groupby("g").mutate(c=1).ungroup(),
+        lambda d: d.astype("b", float),
+    ],
+)
+def test_writing_to_results_does_not_change_input_without_copy_on_write(verb):
+    with pd.option_context("mode.copy_on_write", False):
+        df = _frame()
+        actual = verb(dp(df)).pd
+        actual.loc[0, "a"] = -1
+        actual.loc[0, "b"] = -1
+        assert_frame_equal(df, _frame())
+
+
+@pytest.mark.parametrize(
+    "verb",
+    [
+        lambda d: d.reset_columns(["a", "b", "g"]),
+        lambda d: d.insert(0, "c", 1),
+        lambda d: d.seperate("g", ["h"]),
+    ],
+)
+def test_shallow_copies_without_copy_on_write(verb):
+    # like select, these don't copy values - df's columns stay untouched
+    with pd.option_context("mode.copy_on_write", False):
+        df = _frame()
+        actual = verb(dp(df)).pd
+        assert list(df.columns) == ["a", "b", "g"]
+        assert _shares(df, actual, "a")
+        assert _shares(df, actual, "b")
@@ -0,0 +1,368 @@
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+import pandas.testing
+from plotnine.data import mtcars
+from dppd import dppd, option_context
+
+pa = pytest.importorskip("pyarrow")
+from dppd.io_verbs import ParquetSource  # noqa:E402
+
+assert_frame_equal = pandas.testing.assert_frame_equal
+dp, X = dppd()
+
+
+@pytest.fixture
+def mtcars_parquet(tmp_path):
+    fn = tmp_path / "mtcars.parquet"
+    mtcars.to_parquet(fn, row_group_size=8)
+    return fn
+
+
+def test_read_parquet_is_deferred(mtcars_parquet):
+    source = (
+        dp.read_parquet(mtcars_parquet).select(["name", "hp"]).filter_by(X.hp > 150)
+    )
+    assert isinstance(source.df, ParquetSource)
+    assert source.df.columns == ["name", "hp"]
+    assert source.df.filters == [("hp", ">", 150)]
+    actual = source.pd
+    should = mtcars[mtcars.hp > 150][["name", "hp"]]
+    assert_frame_equal(should, actual)
+
+
+def test_read_parquet_column_spec_against_schema(mtcars_parquet):
+    actual = dp.read_parquet(mtcars_parquet).select("-name").df
+    assert actual.columns == [x for x in mtcars.columns if x != "name"]
+    actual = dp.read_parquet(mtcars_parquet).select(int).df
+    assert actual.columns == list(mtcars.select_dtypes(int).columns)
+    actual = dp.read_parquet(mtcars_parquet).select(("^c",)).select("-carb").df
+    assert actual.columns == ["cyl"]
+    actual = dp.read_parquet(mtcars_parquet).select([X.hp, X.mpg]).df
+    assert actual.columns == ["hp", "mpg"]
+
+
+def test_read_parquet_filters(mtcars_parquet):
+    actual = (
+        dp.read_parquet(mtcars_parquet)
+        .filter_by((X.cyl == 4) & (X.mpg >= 30))
+        .filter_by(X.gear.isin([4, 5]))
+        .filter_by([("am", "==", 1)])
+        .pd
+    )
+    should = mtcars[
+        (mtcars.cyl == 4)
+        & (mtcars.mpg >= 30)
+        & mtcars.gear.isin([4, 5])
+        & (mtcars.am == 1)
+    ]
+    assert_frame_equal(should, actual)
+    with pytest.raises(ValueError):
+        (X.cyl == 4) and (X.mpg > 5)
+
+
+def test_read_parquet_filters_keep_range_index(tmp_path):
+    fn = tmp_path / "range.parquet"
+    df = pd.DataFrame(
+        {"a": np.arange(10), "b": list("abcdefghij")},
+        index=pd.RangeIndex(100, 120, 2, name="row"),
+    )
+    df.to_parquet(fn, row_group_size=3)
+    should = dp(pd.read_parquet(fn)).filter_by(X.a > 6).pd
+    actual = dp.read_parquet(fn).filter_by(X.a > 6).pd
+    assert list(actual.index) == [114, 116, 118]
+    assert_frame_equal(should, actual)
+    actual = dp.read_parquet(fn).select("b").filter_by(X.a.isin([1, 7])).pd
+    assert_frame_equal(df.loc[[102, 114], ["b"]], actual)
+    actual = dp.read_parquet(fn).filter_by(X.a > 20).pd
+    assert_frame_equal(df.iloc[:0], actual, check_index_type=False)
+
+
+def test_read_parquet_materializes_for_other_verbs(mtcars_parquet):
+    actual = dp.read_parquet(mtcars_parquet).select(["name", "hp"]).arrange("hp").pd
+    should = dp(mtcars[["name", "hp"]]).arrange("hp").pd
+    assert_frame_equal(should, actual)
+    # non pushable filter
+    actual = dp.read_parquet(mtcars_parquet).filter_by(lambda df: df.hp > 200).pd
+    assert (actual.hp > 200).all()
+    assert len(actual) == (mtcars.hp > 200).sum()
+    assert len(dp.read_parquet(mtcars_parquet)["hp"].pd) == 32
+
+
+def test_read_parquet_arrow_option(mtcars_parquet):
+    with option_context(arrow=True):
+        actual = dp.read_parquet(mtcars_parquet).select(["name", "hp"]).pd
+    assert isinstance(actual["name"].dtype, pd.ArrowDtype)
+    assert isinstance(actual["hp"].dtype, pd.ArrowDtype)
+
+
+def test_read_parquet_unknown_column(mtcars_parquet):
+    source = dp.read_parquet(mtcars_parquet)
+    with pytest.raises(AttributeError):
+        X.no_such_column
+    with pytest.raises(KeyError):
+        source.select("no_such_column")
+    assert "hp" in repr(source.select("hp").df)
+
+
+def test_to_feather_mmap_roundtrip(tmp_path):
+    fn = tmp_path / "mtcars.arrow"
+    actual = dp(mtcars).filter_by(X.cyl == 4).to_feather_mmap(fn).pd
+    should = mtcars[mtcars.cyl == 4]
+    assert_frame_equal(should, actual)
+    assert_frame_equal(should, dp.read_arrow_mmap(fn).pd)
+    assert_frame_equal(
+        should[["hp", "name"]], dp.read_arrow_mmap(fn, columns=["hp", "name"]).pd
+    )
+
+
+def test_read_arrow_mmap_is_zero_copy(tmp_path):
+    fn = tmp_path / "numbers.arrow"
+    df = pd.DataFrame({"a": np.arange(1000, dtype=float), "b": np.arange(1000)})
+    dp(df).to_feather_mmap(fn).pd
+    actual = dp.read_arrow_mmap(fn).pd
+    assert_frame_equal(df, actual)
+    for column in "ab":
+        # views into the mapped file, not arrays of their own
+        assert not actual[column].values.flags.owndata
+        assert not actual[column].values.flags.writeable
+
+
+def test_to_feather_mmap_overwrite_keeps_mapped_frames_valid(tmp_path):
+    # an earlier frame still maps the file - truncating it in place
+    # would kill the interpreter with SIGBUS, so run this in a subprocess
+    fn = tmp_path / "checkpoint.arrow"
+    code = (
+        "import numpy as np, pandas as pd\n"
+        "from dppd import dppd\n"
+        "dp, X = dppd()\n"
+        f"fn = {str(fn)!r}\n"
+        "old = dp(pd.DataFrame({'a': np.arange(1_000_000.0)})).to_feather_mmap(fn).pd\n"
+        "dp(pd.DataFrame({'a': np.arange(10.0)})).to_feather_mmap(fn).pd\n"
+        "assert old['a'].sum() == np.arange(1_000_000.0).sum()\n"
+        "assert len(dp.read_arrow_mmap(fn).pd) == 10\n"
+    )
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    env["PYTHONPATH"] = os.pathsep.join([src, env.get("PYTHONPATH", "")])
+    p = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert p.returncode == 0, p.stderr
+    assert [x.name for x in tmp_path.iterdir()] == ["checkpoint.arrow"]
+
+
+def test_read_arrow_mmap_arrow_types(tmp_path):
+    fn = tmp_path / "mtcars.arrow"
+    dp(mtcars).to_feather_mmap(fn).pd
+    actual = dp.read_arrow_mmap(fn, arrow=True).pd
+    assert isinstance(actual["name"].dtype, pd.ArrowDtype)
+    with option_context(arrow=True):
+        actual = dp.read_arrow_mmap(fn).pd
+    assert isinstance(actual["hp"].dtype, pd.ArrowDtype)
+    assert list(actual["name"]) == list(mtcars["name"])
+
+
+@pytest.fixture
+def cache_misses(monkeypatch):
+    """The results cache() stored - a stage recording its calls
+    would be fingerprinted along with the record"""
+    misses = []
+    to_parquet = pd.DataFrame.to_parquet
+
+    def spy(self, path, *args, **kwargs):
+        misses.append(path)
+        return to_parquet(self, path, *args, **kwargs)
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", spy)
+    return misses
+
+
+def test_cache(tmp_path, cache_misses):
+    def stage(df, column):
+        return dp(df).groupby("cyl").summarize((column, np.mean, "mean")).pd
+
+    first = dp(mtcars).cache(stage, "hp", path=tmp_path).pd
+    second = dp(mtcars).cache(stage, "hp", path=tmp_path).pd
+    assert len(cache_misses) == 1
+    assert_frame_equal(first, second)
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+    # other arguments, other input - other entries
+    dp(mtcars).cache(stage, "mpg", path=tmp_path).pd
+    dp(mtcars.head(10)).cache(stage, "hp", path=tmp_path).pd
+    assert len(cache_misses) == 3
+    # explicit keys replace the function's fingerprint
+    dp(mtcars).cache(stage, "hp", key="stage", path=tmp_path).pd
+    dp(mtcars).cache(lambda df, column: None, "hp", key="stage", path=tmp_path).pd
+    assert len(cache_misses) == 4
+
+
+def test_cache_fingerprint(tmp_path, cache_misses):
+    def stage(df):
+        return df.head(2)
+
+    df = pd.DataFrame({"a": np.arange(5000), "b": np.arange(5000) * 2.0})
+    dp(df).cache(stage, path=tmp_path, fingerprint="schema").pd
+    other = df.copy()
+    other.loc[1, "b"] = -1  # not in the sample
+    dp(other).cache(stage, path=tmp_path, fingerprint="schema").pd
+    assert len(cache_misses) == 1
+    dp(other).cache(stage, path=tmp_path).pd
+    dp(df).cache(stage, path=tmp_path).pd
+    assert len(cache_misses) == 3
+    other.loc[0, "b"] = -1  # sampled
+    dp(other).cache(stage, path=tmp_path, fingerprint="schema").pd
+    assert len(cache_misses) == 4
+    with pytest.raises(ValueError):
+        dp(df).cache(stage, path=tmp_path, fingerprint="nope")
+    with pytest.raises(TypeError):
+        dp(df).cache(lambda df: df["a"], path=tmp_path)
+
+
+def test_cache_lru_eviction(tmp_path):
+    def stage(df, n):
+        return df.head(n)
+
+    dp(mtcars).cache(stage, 1, path=tmp_path).pd
+    size = next(tmp_path.glob("*.parquet")).stat().st_size
+    files = {}
+    for n in [1, 2, 3]:
+        dp(mtcars).cache(stage, n, path=tmp_path, max_bytes=size * 10).pd
+        files[n] = set(tmp_path.glob("*.parquet"))
+    (first,) = files[1]
+    os.utime(first, (1, 1))  # least recently used
+    dp(mtcars).cache(stage, 1, path=tmp_path).pd  # hit - touches it again
+    (second,) = files[2] - files[1]
+    os.utime(second, (1, 1))
+    dp(mtcars).cache(stage, 4, path=tmp_path, max_bytes=size * 3.5).pd
+    remaining = set(tmp_path.glob("*.parquet"))
+    assert first in remaining
+    assert second not in remaining
+    assert len(remaining) == 3
+
+
+def test_cache_arguments_by_value(tmp_path):
+    def stage(df, other):
+        return pd.DataFrame({"sum": [np.asarray(other).sum()]})
+
+    a = pd.DataFrame({"x": np.arange(100)})
+    b = a.copy()
+    b.loc[50, "x"] = -1  # same (truncated) repr
+    assert repr(a) == repr(b)
+    assert dp(mtcars).cache(stage, a, path=tmp_path).pd["sum"][0] == 4950
+    assert dp(mtcars).cache(stage, b, path=tmp_path).pd["sum"][0] == 4899
+    assert dp(mtcars).cache(stage, a["x"], path=tmp_path).pd["sum"][0] == 4950
+    assert dp(mtcars).cache(stage, b["x"], path=tmp_path).pd["sum"][0] == 4899
+    x = np.arange(10000)
+    y = x.copy()
+    y[5000] = 0
+    assert dp(mtcars).cache(stage, x, path=tmp_path).pd["sum"][0] == x.sum()
+    assert dp(mtcars).cache(stage, y, path=tmp_path).pd["sum"][0] == y.sum()
+    assert dp(mtcars).cache(stage, other=[x], path=tmp_path).pd["sum"][0] == x.sum()
+    assert dp(mtcars).cache(stage, other=[y], path=tmp_path).pd["sum"][0] == y.sum()
+    with pytest.raises(TypeError):
+        dp(mtcars).cache(stage, object(), path=tmp_path)
+
+
+def test_cache_stage_fingerprint_is_stable(tmp_path, cache_misses):
+    source = (
+        "def stage(df):\n"
+        "    return dp(df).summarize(('hp', lambda x: x.max(), 'max')).pd\n"
+    )
+
+    def define():
+        # compiled anew - fresh code objects at new addresses,
+        # as when a notebook cell is re-run
+        namespace = {"dp": dp}
+        exec(compile(source, "<cell>", "exec"), namespace)
+        return namespace["stage"]
+
+    first, second = define(), define()
+    assert first.__code__ is not second.__code__
+    dp(mtcars).cache(first, path=tmp_path).pd
+    dp(mtcars).cache(second, path=tmp_path).pd
+    assert len(cache_misses) == 1
+    namespace = {"dp": dp}
+    exec(compile(source.replace("max()", "min()"), "<cell>", "exec"), namespace)
+    dp(mtcars).cache(namespace["stage"], path=tmp_path).pd
+    assert len(cache_misses) == 2
+
+    code = (
+        "from dppd.io_verbs import _stage_fingerprint\n"
+        "def stage(df):\n"
+        "    return df.apply(lambda x: x.max())\n"
+        "print(_stage_fingerprint(stage))\n"
+    )
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    env["PYTHONPATH"] = os.pathsep.join([src, env.get("PYTHONPATH", "")])
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True
+        ).stdout
+        for _ in range(2)
+    }
+    assert len(fingerprints) == 1
+    assert fingerprints != {""}
+
+
+@pytest.mark.filterwarnings("ignore:The DataFrame has column names of mixed type")
+def test_cache_miss_equals_hit(tmp_path):
+    df = pd.DataFrame({"id": [1, 1, 2], "k": [4, 6, 4], "v": [0.5, 1.5, 2.5]})
+
+    def stage(d):
+        return dp(d).spread("k", "v").pd
+
+    miss = dp(df).cache(stage, path=tmp_path).pd
+    hit = dp(df).cache(stage, path=tmp_path).pd
+    assert_frame_equal(miss, hit)
+    assert list(miss.columns) == ["id", "4", "6"]
+
+
+def test_cache_stage_fingerprint_covers_captured_values(tmp_path):
+    df = pd.DataFrame({"a": np.arange(5)})
+
+    def make(threshold):
+        return lambda d: d[d.a > threshold]
+
+    assert len(dp(df).cache(make(1), path=tmp_path).pd) == 3
+    assert len(dp(df).cache(make(3), path=tmp_path).pd) == 1
+    assert len(dp(df).cache(make(1), path=tmp_path).pd) == 3
+
+    def with_default(d, threshold=1):
+        return d[d.a > threshold]
+
+    assert len(dp(df).cache(with_default, path=tmp_path).pd) == 3
+    with_default.__defaults__ = (2,)
+    assert len(dp(df).cache(with_default, path=tmp_path).pd) == 2
+
+    # a notebook global changed between runs
+    namespace = {"threshold": 1}
+    exec("def stage(d):\n    return d[d.a > threshold]\n", namespace)
+    assert len(dp(df).cache(namespace["stage"], path=tmp_path).pd) == 3
+    namespace["threshold"] = 0
+    assert len(dp(df).cache(namespace["stage"], path=tmp_path).pd) == 4
+
+    lock = object()
+    with pytest.raises(TypeError):
+        dp(df).cache(lambda d: d if lock else None, path=tmp_path)
+    dp(df).cache(lambda d: d if lock else None, key="locked", path=tmp_path).pd
+
+
+def test_read_parquet_keeps_index(tmp_path):
+    fn = tmp_path / "indexed.parquet"
+    df = pd.DataFrame(
+        {"a": [1, 2, 3], "b": ["x", "y", "z"]}, index=pd.Index([10, 20, 30], name="id")
+    )
+    df.to_parquet(fn)
+    assert_frame_equal(df, dp.read_parquet(fn).pd)
+    assert_frame_equal(df[["a"]], dp.read_parquet(fn).select("a").pd)
+    assert_frame_equal(
+        df[df.a > 1][["b"]], dp.read_parquet(fn).select("b").filter_by(X.a > 1).pd
+    )
+    assert_frame_equal(
+        df[df.a > 1][["b"]], dp.read_parquet(fn).filter_by(X.a > 1).select("b").pd
+    )
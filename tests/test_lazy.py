@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+import pytest
+from dppd.lazy import lazy_module
+
+
+def test_lazy_module_imports_on_first_access():
+    m = lazy_module("json")
+    assert not m.loaded
+    assert "not loaded" in repr(m)
+    assert m.dumps([1]) == "[1]"
+    assert m.loaded
+    assert "dumps" in dir(m)
+
+
+def test_lazy_module_missing_raises_on_use():
+    m = lazy_module("dppd_no_such_module")
+    with pytest.raises(ImportError):
+        m.anything
+
+
+def test_import_dppd_does_not_import_heavy_dependencies():
+    heavy = ["scipy", "sklearn", "natsort"]
+    code = (
+        "import sys;import dppd;"
+        f"print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    )
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    env["PYTHONPATH"] = os.pathsep.join([src, env.get("PYTHONPATH", "")])
+    p = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert p.returncode == 0, p.stderr
+    assert p.stdout.strip() == ""
@@ -0,0 +1,127 @@
+import gc
+import pandas as pd
+import pandas.testing
+from plotnine.data import mtcars
+from dppd import dppd, memoize_verbs, register_verb, base, option_context
+
+assert_frame_equal = pandas.testing.assert_frame_equal
+dp, X = dppd()
+
+
+def test_memoize_verbs_hits_and_misses():
+    df = mtcars.copy()
+    with memoize_verbs() as memo:
+        first = dp(df).select(["name", "hp"]).pd
+        second = dp(df).select(["name", "hp"]).pd
+        third = dp(df).select(["name", "mpg"]).pd
+        dp(df).head(5).pd  # not pure
+    assert not base.verb_call_observers
+    assert memo.hits == 1
+    assert memo.misses == 2
+    assert first is second
+    assert list(third.columns) == ["name", "mpg"]
+    assert not memo.entries  # cleared on exit
+
+
+def test_memoize_verbs_hits_every_verb_of_a_repeated_chain():
+    df = mtcars.copy()
+    with memoize_verbs() as memo:
+        first = (
+            dp(df).select(["name", "cyl", "hp"]).arrange("hp").spread("cyl", "hp").pd
+        )
+        assert memo.misses == 3
+        assert memo.hits == 0
+        second = (
+            dp(df).select(["name", "cyl", "hp"]).arrange("hp").spread("cyl", "hp").pd
+        )
+        assert memo.misses == 3
+        assert memo.hits == 3
+        assert len(memo.entries) == 3
+    assert second is first
+
+
+def test_memoize_verbs_keys_on_frame_identity_and_args():
+    a = mtcars.copy()
+    b = mtcars.copy()
+    with memoize_verbs() as memo:
+        dp(a).spread("cyl", "hp").pd
+        dp(b).spread("cyl", "hp").pd
+        dp(a).gather("variable", "value", ["hp", "mpg"]).pd
+        dp(a).gather("variable", "value", ["hp", "mpg"]).pd
+        dp(a).gather("variable", "value", ["mpg", "hp"]).pd
+        dp(a).categorize(["cyl"], {"cyl": 5}).pd
+        dp(a).categorize(["cyl"], {"cyl": 5}).pd
+    assert memo.misses == 5
+    assert memo.hits == 2
+
+
+def test_memoize_verbs_keys_on_options():
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    with memoize_verbs() as memo:
+        plain = dp(df).gather("variable", "value", ["a", "b"]).pd
+        with option_context(arrow=True):
+            arrow = dp(df).gather("variable", "value", ["a", "b"]).pd
+    assert memo.misses == 2
+    assert plain["variable"].dtype == object
+    assert arrow["variable"].dtype != object
+
+
+def test_memoize_verbs_uncacheable():
+    df = mtcars.copy()
+    with memoize_verbs() as memo:
+        dp(df).select(df.columns[:3]).pd  # Index - can't be hashed
+        list(dp(df).gather("variable", "value", ["hp"], chunk_size=1))
+    assert memo.uncacheable == 2
+    assert not memo.entries
+
+
+def test_memoize_verbs_lru_eviction():
+    df = mtcars.copy()
+    one = int(df[["hp"]].memory_usage(deep=True).sum())
+    with memoize_verbs(max_bytes=one * 2) as memo:
+        dp(df).select(["hp"]).pd
+        dp(df).select(["mpg"]).pd
+        dp(df).select(["hp"]).pd  # now the most recently used
+        dp(df).select(["cyl"]).pd  # evicts mpg
+        assert memo.evictions == 1
+        assert memo.nbytes <= one * 2
+        dp(df).select(["hp"]).pd
+        assert memo.stats() == {
+            "hits": 2,
+            "misses": 3,
+            "uncacheable": 0,
+            "evictions": 1,
+            "entries": 2,
+            "nbytes": memo.nbytes,
+        }
+        dp(df).select(["mpg"]).pd
+        assert memo.misses == 4
+        dp(df).pd  # results larger than max_bytes are not stored
+        dp(df).select(None).pd
+        assert len(memo.entries) == 2
+
+
+def test_memoize_verbs_purges_collected_frames():
+    with memoize_verbs() as memo:
+        df = mtcars.copy()
+        dp(df).select(["hp"]).pd
+        assert len(memo.entries) == 1
+        del df
+        dp(mtcars).pd  # the stacked X holds a reference to the last frame
+        gc.collect()
+        assert not memo.entries
+        assert memo.nbytes == 0
+
+
+def test_register_verb_pure():
+    def memo_test_verb(df):
+        return df.head(1)
+
+    register_verb("memo_test_verb", types=pd.DataFrame, pure=True)(memo_test_verb)
+    assert ("memo_test_verb", pd.DataFrame) in base.pure_verbs
+    register_verb("memo_test_verb", types=pd.DataFrame, ignore_redefine=True)(
+        lambda df: df
+    )
+    assert ("memo_test_verb", pd.DataFrame) not in base.pure_verbs
+    assert ("select", pd.DataFrame) in base.pure_verbs
+    assert ("head", pd.DataFrame) not in base.pure_verbs
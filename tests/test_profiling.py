@@ -0,0 +1,151 @@
+import os
+import subprocess
+import sys
+import pandas as pd
+import json
+from dppd import dppd, profile_verbs, trace_verbs, base
+from plotnine.data import mtcars
+
+dp, X = dppd()
+
+
+def test_profile_verbs_records_calls():
+    with profile_verbs() as profiler:
+        dp(mtcars).select(["cyl", "hp"]).groupby("cyl").mutate(x=1).ungroup().pd
+    assert not base.verb_call_observers
+    records = profiler.to_frame()
+    assert list(records["verb"]) == ["select", "groupby", "mutate", "ungroup"]
+    first = profiler.records[0]
+    assert first["type"] == "DataFrame"
+    assert first["rows_in"] == 32
+    assert first["columns_in"] == 12
+    assert first["rows_out"] == 32
+    assert first["columns_out"] == 2
+    assert profiler.records[3]["columns_out"] == 3
+    assert (records["wall_time"] >= 0).all()
+    assert (records["cpu_time"] >= 0).all()
+    assert (records["depth"] == 0).all()
+    assert "memory_delta" not in first
+
+
+def test_profile_verbs_memory_and_sink():
+    received = []
+    with profile_verbs(received.append, memory=True, deep=True) as profiler:
+        dp(mtcars).head(5).pd
+    assert not profiler.records
+    assert len(received) == 1
+    rec = received[0]
+    assert rec["memory_in"] == mtcars.memory_usage(deep=True).sum()
+    assert rec["memory_out"] == mtcars.head(5).memory_usage(deep=True).sum()
+    assert rec["memory_delta"] == rec["memory_out"] - rec["memory_in"]
+
+
+def test_profile_verbs_nested():
+    def nested(df):
+        return dp(df).head(3).pd
+
+    from dppd import register_verb
+
+    register_verb("profiling_test_nested", types=pd.DataFrame)(nested)
+    with profile_verbs() as profiler:
+        dp(mtcars).profiling_test_nested().pd
+    assert [(r["verb"], r["depth"]) for r in profiler.records] == [
+        ("head", 1),
+        ("profiling_test_nested", 0),
+    ]
+
+
+def test_profile_verbs_exception_still_uninstalls():
+    try:
+        with profile_verbs():
+            dp(mtcars).select("no such column")
+    except KeyError:
+        pass
+    assert not base.verb_call_observers
+
+
+def test_profile_from_environment():
+    code = (
+        "import pandas as pd;import dppd;dp, X = dppd.dppd();"
+        "dp(pd.DataFrame({'a': [1, 2]})).head(1).pd"
+    )
+    env = dict(os.environ, DPPD_PROFILE="memory")
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    env["PYTHONPATH"] = os.pathsep.join([src, env.get("PYTHONPATH", "")])
+    p = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert p.returncode == 0, p.stderr
+    assert "verb=head" in p.stderr
+    assert "memory_delta=" in p.stderr
+
+
+def test_trace_verbs_chrome_trace(tmpdir):
+    with trace_verbs() as tracer:
+        dp(mtcars).select(["cyl", "hp"]).groupby("cyl").do(
+            lambda df: dp(df).head(1).pd
+        ).pd
+    assert not base.verb_call_observers
+    fn = str(tmpdir / "trace.json")
+    tracer.to_chrome_trace(fn)
+    with open(fn) as op:
+        trace = json.load(op)
+    events = trace["traceEvents"]
+    assert [e["name"] for e in events] == [
+        "select",
+        "groupby",
+        "do",
+        "do group",
+        "head",
+        "do group",
+        "head",
+        "do group",
+        "head",
+    ]
+    assert all(e["ph"] == "X" for e in events)
+    do_event = events[2]
+    for e in events[3:]:
+        assert e["ts"] >= do_event["ts"]
+        assert e["ts"] + e["dur"] <= do_event["ts"] + do_event["dur"]
+    assert events[0]["args"]["rows_in"] == 32
+    assert events[0]["args"]["columns_out"] == 2
+    assert events[3]["args"]["group"] == "4"
+    assert events[3]["args"]["rows"] == 11
+    assert events[4]["args"]["rows_out"] == 1
+
+
+def test_trace_verbs_group_spans_summarize_and_mutate():
+    with trace_verbs() as tracer:
+        dp(mtcars).groupby("cyl").summarize(("hp", len)).pd
+        dp(mtcars).groupby("am").mutate(x=lambda df: df["hp"]).pd
+    names = [s["name"] for s in tracer.spans]
+    assert names.count("summarize group") == 3
+    assert names.count("mutate group") == 2
+    by_id = {s["span_id"]: s for s in tracer.spans}
+    for s in tracer.spans:
+        if s["category"] == "group":
+            assert by_id[s["parent_id"]]["name"] == s["name"].split()[0]
+
+
+def test_trace_verbs_otlp():
+    try:
+        with trace_verbs() as tracer:
+            dp(mtcars).head(2).select("no such column")
+    except KeyError:
+        pass
+    request = tracer.to_otlp(service_name="nightly")
+    resource_spans = request["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "nightly"}}
+    ]
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["head", "select"]
+    assert len({s["traceId"] for s in spans}) == 1
+    assert len(spans[0]["traceId"]) == 32
+    assert len(spans[0]["spanId"]) == 16
+    assert spans[0]["parentSpanId"] == ""
+    assert int(spans[0]["endTimeUnixNano"]) >= int(spans[0]["startTimeUnixNano"])
+    attributes = {a["key"]: a["value"] for a in spans[0]["attributes"]}
+    assert attributes["dppd.rows_out"] == {"intValue": "2"}
+    assert spans[0]["status"]["code"] == 0
+    assert spans[1]["status"]["code"] == 2
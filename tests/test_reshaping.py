@@ -95,6 +95,38 @@ def test_gather_iris():
     assert_frame_equal(actual, actual2)
 
 
+def test_gather_categorical_key():
+    stocks = get_stocks()
+    actual = dp(stocks).gather("stock", "price", "-time", categorical_key=True).pd
+    should = pd.melt(stocks, ["time"], ["X", "Y", "Z"], "stock", "price")
+    assert isinstance(actual["stock"].dtype, pd.CategoricalDtype)
+    assert list(actual["stock"].cat.categories) == ["X", "Y", "Z"]
+    should = should.assign(stock=pd.Categorical(should["stock"], ["X", "Y", "Z"]))
+    assert_frame_equal(should, actual)
+
+
+def test_gather_chunked():
+    stocks = get_stocks()
+    should = pd.melt(stocks, ["time"], ["X", "Y", "Z"], "stock", "price")
+    blocks = list(dp(stocks).gather("stock", "price", "-time", chunk_size=2))
+    assert len(blocks) == 2
+    assert len(blocks[0]) == 20
+    assert len(blocks[1]) == 10
+    assert_frame_equal(should, pd.concat(blocks))
+
+    blocks = dp(stocks).gather(
+        "stock", "price", "-time", categorical_key=True, chunk_size=1
+    )
+    actual = pd.concat(list(blocks))
+    assert list(actual["stock"].cat.categories) == ["X", "Y", "Z"]
+    assert (actual["stock"].astype(str) == should["stock"]).all()
+
+
+def test_gather_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        dp(get_stocks()).gather("stock", "price", "-time", chunk_size=0)
+
+
 def test_basic_spread():
     stocks = get_stocks()
     tidy_stocks = dp(stocks).gather("stock", "price", "-time").pd
@@ -143,6 +175,54 @@ def test_seperate_and_remove():
     assert "X" not in actual.columns
 
 
+def test_seperate_max_splits():
+    df = pd.DataFrame({"X": ["a.b.c", "d.e", "f"]}, index=[3, 3, 1])
+    actual = dp(df).seperate("X", ["A", "B"], n=1).pd
+    assert list(actual.A) == ["a", "d", "f"]
+    assert list(actual.B.iloc[:2]) == ["b.c", "e"]
+    assert actual.B.iloc[2] is None
+    assert list(actual.index) == [3, 3, 1]
+    with pytest.raises(ValueError):
+        dp(df).seperate("X", ["A", "B"])
+
+
+@pytest.mark.parametrize(
+    "values, sep, regex",
+    [
+        (["a.b.c", None, np.nan, "d", "", "e.", ".f"], ".", None),
+        (["a::b::c", None, "d", "e::"], "::", False),
+        (["a.b", "c", 5], ".", None),
+        (["a", None, "b"], ".", None),
+    ],
+)
+def test_seperate_once_on_literal_matches_str_split(values, sep, regex):
+    df = pd.DataFrame({"X": values}, index=range(10, 10 + len(values)))
+    expected = df["X"].str.split(sep, n=1, expand=True, regex=regex)
+    names = ["A", "B"][: expected.shape[1]]
+    actual = dp(df).seperate("X", names, sep=sep, n=1, regex=regex).pd
+    for ii, name in enumerate(names):
+        assert_series_equal(actual[name], expected[ii], check_names=False)
+        assert [type(x) for x in actual[name]] == [type(x) for x in expected[ii]]
+
+
+@pytest.mark.parametrize("dtype", ["string[pyarrow]", "arrow"])
+def test_seperate_arrow(dtype):
+    pa = pytest.importorskip("pyarrow")
+    if dtype == "arrow":
+        dtype = pd.ArrowDtype(pa.string())
+    df = pd.DataFrame({"X": [None, "a.b", "a.d", "b.c.e"], "Y": [1, 2, 3, 4]})
+    df = df.astype({"X": dtype})
+    actual = dp(df).seperate("X", ["A", "B"], n=1, remove=True).pd
+    assert list(actual.columns) == ["Y", "A", "B"]
+    assert actual["A"].dtype == df["X"].dtype
+    assert actual.A.isnull().iloc[0]
+    assert actual.B.isnull().iloc[0]
+    assert list(actual.A.iloc[1:]) == ["a", "a", "b"]
+    assert list(actual.B.iloc[1:]) == ["b", "d", "c.e"]
+    with pytest.raises(ValueError):
+        dp(df).seperate("X", ["A", "B"])
+
+
 def test_seperate_raises_on_multi_column_spec():
     df = pd.DataFrame({"X": [None, "a.b", "a.d", "b.c"], "Y": 5})
     with pytest.raises(ValueError):
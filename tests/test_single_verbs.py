@@ -210,6 +210,22 @@ def test_groupby_add_count():
     assert_frame_equal(should, actual)
 
 
+def test_add_count_name_and_wt():
+    df = pd.DataFrame({"x": [1, 5, 2, 2, 4, 0, 4], "y": [1, 2, 3, 4, 5, 6, 5]})
+    actual = dp(df).add_count("n", wt="y").pd
+    assert (actual["n"] == 26).all()
+    actual = dp(df).groupby("x").add_count(name="n", wt=X.y).ungroup().pd
+    assert list(actual["n"]) == [1, 2, 7, 7, 10, 6, 10]
+    assert "count" not in actual.columns
+
+
+def test_groupby_add_count_stays_grouped():
+    df = pd.DataFrame({"x": [1, 5, 2, 2, 4, 0, 4], "y": [1, 2, 3, 4, 5, 6, 5]})
+    actual = dp(df).groupby("x").add_count().pd
+    assert isinstance(actual, pd.core.groupby.DataFrameGroupBy)
+    assert list(actual["count"].max()) == [1, 1, 2, 2, 1]
+
+
 def test_groupby_head():
     actual = dp(mtcars).groupby("cyl").head(1).select("name").pd
     should = (
@@ -274,6 +290,104 @@ def test_sorting_within_groups_head_ungroup():
     assert_frame_equal(should, actual)
 
 
+def test_sorting_within_groups_by_group_codes():
+    for spec in ["qsec", ["-hp", "qsec"]]:
+        should = (
+            dp(mtcars).groupby(["cyl", "name"]).arrange(spec, "mergesort").ungroup().pd
+        )
+        actual = (
+            dp(mtcars)
+            .groupby(["cyl", "name"])
+            .arrange(spec, kind="mergesort", by_group_codes=True)
+            .ungroup()
+            .pd
+        )
+        assert_frame_equal(should, actual)
+    should = dp(mtcars).groupby("gear").sort_values("-mpg", "mergesort").ungroup().pd
+    actual = (
+        dp(mtcars)
+        .groupby("gear")
+        .sort_values("-mpg", "mergesort", by_group_codes=True)
+        .ungroup()
+        .pd
+    )
+    assert_frame_equal(should, actual)
+
+
+def test_sorting_within_groups_by_group_codes_keeps_grouper(monkeypatch):
+    df = pd.DataFrame(
+        {
+            "g": ["id-b", "id-a", "id-b", "id-c", "id-a", "id-b"],
+            "c": pd.Categorical(list("yxzxzy"), categories=["z", "y", "x"]),
+            "v": [1.0, np.nan, 3.0, 2.0, 2.0, 1.0],
+        }
+    )
+    actual = dp(df).groupby("g").arrange(["-v", "c"], by_group_codes=True).pd
+    calls = []
+    factorize = pd.core.algorithms.factorize
+    monkeypatch.setattr(
+        pd.core.algorithms,
+        "factorize",
+        lambda *args, **kwargs: calls.append(1) or factorize(*args, **kwargs),
+    )
+    assert list(actual.ngroup()) == [0, 0, 1, 1, 1, 2]
+    assert actual["v"].sum().tolist() == [2.0, 5.0, 2.0]
+    assert not calls  # the group keys were not factorized again
+    monkeypatch.undo()
+    should = df.sort_values(
+        ["g", "v", "c"], ascending=[True, False, True], kind="mergesort"
+    )
+    assert_frame_equal(should, actual.obj)
+    assert_series_equal(should.groupby("g")["v"].sum(), actual["v"].sum())
+    for (key, sub_df), (should_key, should_sub_df) in zip(actual, should.groupby("g")):
+        assert key == should_key
+        assert_frame_equal(should_sub_df, sub_df)
+
+
+def test_sorting_within_groups_by_group_codes_nan_keys():
+    df = pd.DataFrame({"g": ["b", None, "a", "b", None, "a"], "v": [3, 2, 1, 0, 5, 4]})
+    for na_position in ["last", "first"]:
+        should = (
+            dp(df)
+            .groupby("g")
+            .arrange("v", "mergesort", na_position=na_position)
+            .ungroup()
+            .pd
+        )
+        actual = (
+            dp(df)
+            .groupby("g")
+            .arrange("v", "mergesort", na_position=na_position, by_group_codes=True)
+            .ungroup()
+            .pd
+        )
+        assert_frame_equal(should, actual)
+        if na_position == "last":
+            assert list(actual.index) == [2, 5, 3, 0, 1, 4]
+    assert actual.g.isnull().iloc[:2].all()
+
+    # rows with some missing keys are ordered by the keys they do have
+    df = pd.DataFrame(
+        {
+            "g": [None, None, "a", "a", None, "b"],
+            "h": [2, 1, 1, None, 0, None],
+            "v": [1, 2, 3, 4, 5, 6],
+        }
+    )
+    for na_position in ["last", "first"]:
+        grouped = dp(df).groupby(["g", "h"])
+        should = grouped.arrange("v", na_position=na_position).ungroup().pd
+        grouped = dp(df).groupby(["g", "h"])
+        actual = (
+            grouped.arrange("v", na_position=na_position, by_group_codes=True)
+            .ungroup()
+            .pd
+        )
+        assert_frame_equal(should, actual)
+        if na_position == "last":
+            assert list(actual.index) == [2, 3, 5, 4, 1, 0]
+
+
 def test_select_in_grouping_keeps_groups():
     actual = dp(mtcars).groupby("cyl").select("qsec").ungroup().pd
     assert (actual.columns == ["cyl", "qsec"]).all()
@@ -788,6 +902,24 @@ def test_groupby_within_chain():
     assert_frame_equal(should, actual)
 
 
+def test_grouped_verbs_reuse_grouper():
+    grp = mtcars.groupby(["cyl", "am"])
+    selected = dp(grp).select(["hp", "qsec"]).pd
+    assert selected._grouper is grp._grouper
+    unselected = dp(selected).unselect("qsec").pd
+    assert unselected._grouper is grp._grouper
+    mutated = dp(unselected).mutate(hp2=mtcars.hp * 2).pd
+    assert mutated._grouper is grp._grouper
+    assert_frame_equal(
+        mutated.mean(),
+        mtcars.assign(hp2=mtcars.hp * 2).groupby(["cyl", "am"])[["hp", "hp2"]].mean(),
+    )
+    # changing a group column must regroup
+    regrouped = dp(grp).mutate(cyl=mtcars.cyl * 0).pd
+    assert regrouped._grouper is not grp._grouper
+    assert regrouped.ngroups == 2
+
+
 def test_groupby_within_chain_select_on_group():
     actual = dp(mtcars).groupby("cyl").select("hp").mean().pd
     should = mtcars.groupby("cyl")[["hp"]].mean()
@@ -900,6 +1032,40 @@ def test_categorize():
     assert len(actual3["a"].cat.categories) == 5
 
 
+def test_categorize_missing_values():
+    df = pd.DataFrame({"a": ["b", None, "a", "b", np.nan]})
+    actual = dp(df).categorize("a").pd
+    assert list(actual["a"].cat.categories) == ["b", "a"]
+    assert list(actual["a"].cat.codes) == [0, -1, 1, 0, -1]
+
+
+def test_categorize_natsorted():
+    df = pd.DataFrame(
+        {"a": ["a10", "a2", None, "a1", "a2"], "b": ["x", "y", "x", "y", "z"]}
+    )
+    actual = dp(df).categorize("a", "natsorted").pd
+    assert list(actual["a"].cat.categories) == ["a1", "a2", "a10"]
+    assert (actual["a"].astype(object).fillna("") == df["a"].fillna("")).all()
+
+
+def test_categorize_already_categorical():
+    df = pd.DataFrame(
+        {"a": pd.Categorical(["x", "y", "x"], categories=["y", "x", "z"])}
+    )
+    actual = dp(df).categorize("a").pd
+    assert list(actual["a"].cat.categories) == ["x", "y"]
+    assert list(actual["a"]) == ["x", "y", "x"]
+
+
+def test_categorize_parallel():
+    df = pd.DataFrame(
+        {"a": ["hello", "hello", "world"], "b": ["zanother", "category", "level"]}
+    )
+    actual = dp(df).categorize(n_jobs=2).pd
+    should = dp(df).categorize().pd
+    assert_frame_equal(should, actual)
+
+
 def test_print(capsys):
     assert isinstance(dp(mtcars).head().print().pd, pd.DataFrame)
     captured = capsys.readouterr().out
@@ -930,6 +1096,50 @@ def test_iter_tuples_in_group_by():
     assert actual == should
 
 
+def test_iter_tuples_in_group_by_multiple_columns():
+    actual = {k: list(v) for (k, v) in dp(mtcars).groupby(["cyl", "am"]).itertuples()}
+    should = {}
+    for key, sub_df in mtcars.groupby(["cyl", "am"]):
+        should[key] = list(sub_df.itertuples())
+    assert actual == should
+
+
+def test_iter_tuples_in_group_by_lazy():
+    it = dp(mtcars).groupby("cyl").iter_tuples(lazy=True)
+    key, tuples = next(it)
+    assert key == (6,)  # group of the first row
+    assert not isinstance(tuples, list)
+    assert list(tuples) == list(mtcars[mtcars.cyl == 6].itertuples())
+    actual = {k: list(v) for (k, v) in dp(mtcars).groupby("cyl").iter_tuples(True)}
+    should = {k: list(v) for (k, v) in dp(mtcars).groupby("cyl").iter_tuples()}
+    assert actual == should
+
+
+def test_iter_tuples_in_group_by_missing_keys_and_order():
+    df = pd.DataFrame(
+        {
+            "g": ["b", None, "a", "b", None, np.nan, "a"],
+            "h": [1, 1, 1, 2, 1, 1, 1],
+            "v": range(7),
+        }
+    )
+    for lazy in [False, True]:
+        actual = [
+            (k, [t.v for t in v])
+            for (k, v) in dp(df).groupby("g").iter_tuples(lazy=lazy)
+        ]
+        assert actual == [(("b",), [0, 3]), ((None,), [1, 4, 5]), (("a",), [2, 6])]
+    actual = [
+        (k, [t.v for t in v]) for (k, v) in dp(df).groupby(["g", "h"]).iter_tuples()
+    ]
+    assert actual == [
+        (("b", 1), [0]),
+        ((None, 1), [1, 4, 5]),
+        (("a", 1), [2, 6]),
+        (("b", 2), [3]),
+    ]
+
+
 def test_natsort():
     df = pd.DataFrame({"a": ["1", "16", "2"], "b": ["another", "category", "level"]})
     df = dp(df).natsort("a").pd
@@ -999,6 +1209,40 @@ def test_binarize_no_drop():
     assert_frame_equal(should, actual)
 
 
+def test_binarize_missing_values():
+    df = pd.DataFrame({"x": [1, 2, 3], "group": pd.Categorical(["a", None, "b"])})
+    actual = dp(df).binarize("group").pd
+    assert (actual["group-a"] == [True, False, False]).all()
+    assert (actual["group-b"] == [False, False, True]).all()
+
+
+def test_binarize_sparse():
+    df = pd.DataFrame(
+        {"x": [1, 2, 3], "group": ["a", "a", "b"], "other": ["c", "d", "c"]},
+        index=[5, 6, 7],
+    )
+    df = dp(df).categorize(["group", "other"]).pd
+    dense = dp(df).binarize(["group", "other"]).pd
+    actual = dp(df).binarize(["group", "other"], sparse=True).pd
+    assert isinstance(actual["group-a"].dtype, pd.SparseDtype)
+    assert actual["group-a"].dtype.fill_value is False
+    assert actual["group-b"].tolist() == [False, False, True]
+    assert (actual.index == [5, 6, 7]).all()
+    assert_frame_equal(
+        dense, actual.astype({c: bool for c in actual.columns if c != "x"})
+    )
+
+
+def test_binarize_scipy():
+    pytest.importorskip("scipy")
+    df = pd.DataFrame({"x": [1, 2, 3], "group": ["a", "a", "b"]})
+    df = dp(df).categorize("group").pd
+    matrix, names = dp(df).binarize("group", sparse="scipy")
+    assert names == ["group-a", "group-b"]
+    assert matrix.shape == (3, 2)
+    assert (matrix.toarray() == [[True, False], [True, False], [False, True]]).all()
+
+
 def test_dataframe_from_dict():
     actual = dp({"x": [1, 2, 3], "y": ["a", "b", "c"]}).to_frame().pd
     should = pd.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]})
@@ -1029,3 +1273,320 @@ def test_dataframe_insert():
     )
     should = pd.DataFrame({"a": [4, 5, 6], "x": [1, 2, 3], "y": ["a", "b", "c"]})
     assert_frame_equal(actual, should)
+
+
+def test_slice_max_min():
+    actual = dp(mtcars).slice_max("hp", 3).pd
+    should = mtcars.sort_values("hp", ascending=False, kind="mergesort").head(3)
+    assert_frame_equal(should, actual)
+    actual = dp(mtcars).slice_max("-hp", 3).pd
+    should = mtcars.sort_values("hp", kind="mergesort").head(3)
+    assert_frame_equal(should, actual)
+    assert_frame_equal(dp(mtcars).slice_min("hp", 3).pd, should)
+    actual = dp(mtcars).slice_min(["cyl", "-qsec"], 4).pd
+    should = mtcars.sort_values(
+        ["cyl", "qsec"], ascending=[True, False], kind="mergesort"
+    ).head(4)
+    assert_frame_equal(should, actual)
+    actual = dp(mtcars).slice_max("name", 2).pd
+    assert list(actual.name) == ["Volvo 142E", "Valiant"]
+
+
+def test_slice_max_keeps_nan_only_if_needed():
+    df = pd.DataFrame({"a": [1.0, np.nan, 3.0]})
+    assert list(dp(df).slice_max("a", 2).pd.a) == [3.0, 1.0]
+    assert list(dp(df).slice_max("a", 3).pd.index) == [2, 0, 1]
+
+
+def test_slice_max_grouped():
+    actual = dp(mtcars).groupby("cyl").slice_max("hp", 2).pd
+    assert isinstance(actual, pd.core.groupby.DataFrameGroupBy)
+    should = (
+        mtcars.sort_values(["cyl", "hp"], ascending=[True, False], kind="mergesort")
+        .groupby("cyl")
+        .head(2)
+    )
+    assert_frame_equal(should, actual.obj)
+    actual = dp(mtcars).groupby(["cyl", "am"]).slice_min(["qsec", "-hp"]).ungroup().pd
+    should = (
+        mtcars.sort_values(
+            ["cyl", "am", "qsec", "hp"],
+            ascending=[True, True, True, False],
+            kind="mergesort",
+        )
+        .groupby(["cyl", "am"])
+        .head(1)
+    )
+    assert_frame_equal(should[actual.columns], actual)
+
+
+def test_slice_max_grouped_matches_arrange_head():
+    np.random.seed(0)
+    df = pd.DataFrame(
+        {
+            "g": np.random.choice(["x", "y", None, "z"], 500),
+            "v": np.random.choice([1.0, 2.0, 3.0, np.nan], 500),
+            "w": pd.array(np.random.randint(0, 5, 500), dtype="Int64"),
+            "c": pd.Categorical(
+                np.random.choice(list("abc"), 500), categories=["c", "a", "b"]
+            ),
+        }
+    )
+    df.loc[df.g == "z", "v"] = np.nan  # fewer values than n
+    df.loc[df.index[-3:], "g"] = "single"
+    # spec, sort columns, ascending for slice_max
+    specs = [
+        ("v", ["v"], [False]),
+        ("-v", ["v"], [True]),
+        (["v", "c"], ["v", "c"], [False, False]),
+        (["w", "-v"], ["w", "v"], [False, True]),
+        ("c", ["c"], [False]),
+        (["-c", "w"], ["c", "w"], [True, False]),
+    ]
+    for spec, columns, ascending in specs:
+        for n in [1, 2, 7, 200]:
+            for func, flip in [("slice_max", False), ("slice_min", True)]:
+                actual = getattr(dp(df).groupby("g"), func)(spec, n).pd
+                should = (
+                    df.dropna(subset=["g"])
+                    .sort_values(
+                        ["g"] + columns,
+                        ascending=[True] + [x != flip for x in ascending],
+                        kind="mergesort",
+                    )
+                    .groupby("g")
+                    .head(n)
+                )
+                assert_frame_equal(should, actual.obj)
+                assert_series_equal(should.groupby("g").size(), actual.size())
+    assert len(dp(df).groupby("g").slice_max("v", 0).pd.obj) == 0
+
+
+def test_slice_max_grouped_categorical_unobserved():
+    # k == 0 only occurs in a row with a missing key, which slice_max drops
+    df = pd.DataFrame(
+        {"c": pd.Categorical(["a", "b", None]), "k": [1, 1, 0], "v": [1, 2, 3]}
+    )
+    actual = dp(df).groupby(["c", "k"], observed=False).slice_max("v", 1).pd
+    should = actual.obj.groupby(["c", "k"], observed=False)
+    assert_series_equal(should.v.sum(), actual.v.sum())
+    assert list(actual.size().index) == [("a", 1), ("b", 1)]
+
+
+def test_top_n():
+    assert_frame_equal(dp(mtcars).top_n(3, "hp").pd, dp(mtcars).slice_max("hp", 3).pd)
+    assert_frame_equal(dp(mtcars).top_n(-3, "hp").pd, dp(mtcars).slice_min("hp", 3).pd)
+    grouped = dp(mtcars).groupby("cyl").top_n(1, "mpg").ungroup().pd
+    assert list(grouped.name) == [
+        "Toyota Corolla",
+        "Hornet 4 Drive",
+        "Pontiac Firebird",
+    ]
+
+
+def _norm_0_to_1_reference(df, axis=1, keep_nan=False):
+    a1, a2 = (1, 0) if axis == 1 else (0, 1)
+    df_normed = df.sub(df.min(axis=a1), axis=a2)
+    df_normed = df_normed.div(df_normed.max(axis=a1), axis=a2)
+    if not keep_nan:
+        df_normed = df_normed[~pd.isnull(df_normed).any(axis=1)]
+    return df_normed
+
+
+def _numeric_frame():
+    df = pd.DataFrame(
+        np.random.default_rng(5).normal(size=(50, 4)), columns=list("abcd")
+    )
+    df.iloc[3, 1] = np.nan
+    df.iloc[7, :] = 1.0  # constant row
+    return df
+
+
+@pytest.mark.parametrize("axis", [0, 1])
+@pytest.mark.parametrize("keep_nan", [True, False])
+@pytest.mark.parametrize("chunk_size", [None, 1, 7])
+def test_norm_0_to_1(axis, keep_nan, chunk_size):
+    df = _numeric_frame()
+    actual = dp(df).norm_0_to_1(axis=axis, keep_nan=keep_nan, chunk_size=chunk_size).pd
+    should = _norm_0_to_1_reference(df, axis, keep_nan)
+    assert_frame_equal(should, actual)
+
+
+def test_norm_0_to_1_mixed_int_columns():
+    df = mtcars.select_dtypes(np.number)
+    assert_frame_equal(
+        _norm_0_to_1_reference(df.astype(float)),
+        dp(df).norm_0_to_1(chunk_size=5).pd,
+    )
+
+
+def test_norm_0_to_1_float32_out_and_inplace():
+    df = _numeric_frame()
+    actual = dp(df).norm_0_to_1(dtype=np.float32, keep_nan=True).pd
+    assert (actual.dtypes == np.float32).all()
+    should = _norm_0_to_1_reference(df, keep_nan=True)
+    assert_frame_equal(should.astype(np.float32), actual, rtol=1e-5)
+
+    out = np.empty(df.shape, dtype=np.float32)
+    actual = dp(df).norm_0_to_1(out=out, keep_nan=True, chunk_size=10).pd
+    assert np.shares_memory(actual.to_numpy(), out)
+    assert_frame_equal(should.astype(np.float32), actual, rtol=1e-5)
+    with pytest.raises(ValueError):
+        dp(df).norm_0_to_1(out=np.empty((2, 2), dtype=np.float32))
+
+    copy = df.copy()
+    actual = dp(copy).norm_0_to_1(inplace=True, keep_nan=True).pd
+    assert actual is copy
+    assert_frame_equal(should, copy)
+    with pytest.raises(ValueError):
+        dp(df.copy()).norm_0_to_1(inplace=True, dtype=np.float32)
+    with pytest.raises(ValueError):
+        dp(mtcars).select(["hp", "mpg"]).norm_0_to_1(inplace=True)
+
+
+def test_norm_0_to_1_raises_on_invalid_axis():
+    with pytest.raises(ValueError):
+        dp(_numeric_frame()).norm_0_to_1(axis=2)
+
+
+@pytest.mark.parametrize("axis", [0, 1])
+@pytest.mark.parametrize("ddof", [0, 1])
+@pytest.mark.parametrize("nan_policy", ["propagate", "omit"])
+@pytest.mark.parametrize("chunk_size", [None, 1, 7])
+def test_zscore_matches_scipy(axis, ddof, nan_policy, chunk_size):
+    scipy_stats = pytest.importorskip("scipy.stats")
+    df = _numeric_frame()
+    df.iloc[10:20, 2] = np.nan
+    actual = (
+        dp(df)
+        .zscore(axis=axis, ddof=ddof, nan_policy=nan_policy, chunk_size=chunk_size)
+        .pd
+    )
+    should = pd.DataFrame(
+        scipy_stats.zscore(df, axis=axis, ddof=ddof, nan_policy=nan_policy),
+        index=df.index,
+        columns=df.columns,
+    )
+    assert_frame_equal(should, actual)
+
+
+def test_zscore_defaults_to_rows():
+    df = mtcars.select_dtypes(np.number)
+    actual = dp(df).zscore().pd
+    should = df.sub(df.mean(axis=1), axis=0).div(df.std(axis=1, ddof=0), axis=0)
+    assert_frame_equal(should, actual)
+    actual = dp(df).zscore(axis=0).pd
+    should = (df - df.mean()) / df.std(ddof=0)
+    assert_frame_equal(should, actual)
+
+
+def test_zscore_float32_inplace_and_raise():
+    df = _numeric_frame()
+    should = dp(df).zscore(axis=0).pd
+    actual = dp(df).zscore(axis=0, dtype=np.float32, chunk_size=9).pd
+    assert (actual.dtypes == np.float32).all()
+    assert_frame_equal(should.astype(np.float32), actual, rtol=1e-5)
+    copy = df.copy()
+    assert dp(copy).zscore(axis=0, inplace=True).pd is copy
+    assert_frame_equal(should, copy)
+    with pytest.raises(ValueError):
+        dp(df).zscore(nan_policy="raise")
+    with pytest.raises(ValueError):
+        dp(df).zscore(axis=0, nan_policy="raise", chunk_size=2)
+    with pytest.raises(ValueError):
+        dp(df).zscore(nan_policy="nope")
+    with pytest.raises(ValueError):
+        dp(df).zscore(axis=2)
+
+
+def test_log2():
+    df = mtcars.assign(zero=0)
+    numeric = df.select_dtypes(np.number)
+    actual = dp(df).log2().pd
+    assert_frame_equal(np.log2(numeric.astype(float)), actual)
+    actual = dp(df).log2(pseudocount=1).pd
+    assert_frame_equal(np.log2(numeric + 1.0), actual)
+    actual = dp(df).log2(keep_non_numeric=True).pd
+    assert list(actual.columns) == list(df.columns)
+    assert (actual["name"] == df["name"]).all()
+    assert_frame_equal(np.log2(numeric.astype(float)), actual[numeric.columns])
+
+
+def test_log_bases_and_log1p():
+    df = mtcars.select_dtypes(np.number)
+    assert_frame_equal(np.log(df.astype(float)), dp(df).log().pd)
+    assert_frame_equal(np.log10(df.astype(float)), dp(df).log(10).pd)
+    assert_frame_equal(np.log2(df.astype(float)), dp(df).log(2).pd)
+    assert_frame_equal(
+        np.log(df.astype(float) + 0.5) / np.log(3), dp(df).log(3, pseudocount=0.5).pd
+    )
+    assert_frame_equal(np.log1p(df.astype(float)), dp(df).log1p().pd)
+
+
+def test_log2_float32_out_and_inplace():
+    df = mtcars[["mpg", "wt"]].astype(np.float32)
+    should = np.log2(df)
+    actual = dp(df).log2().pd
+    assert (actual.dtypes == np.float32).all()
+    assert_frame_equal(should, actual)
+    out = np.empty(df.shape, dtype=np.float32)
+    actual = dp(df).log2(out=out).pd
+    assert np.shares_memory(actual.to_numpy(), out)
+    assert_frame_equal(should, actual)
+    copy = df.copy()
+    assert dp(copy).log2(inplace=True).pd is copy
+    assert_frame_equal(should, copy)
+    with pytest.raises(ValueError):
+        dp(mtcars).log2(inplace=True)
+    with pytest.raises(ValueError):
+        dp(df).log2(out=np.empty((3, 3)))
+
+
+def test_pca():
+    decomposition = pytest.importorskip("sklearn.decomposition")
+    df = mtcars.select_dtypes(np.number)
+    actual = dp(df).pca(n_components=3).pd
+    assert list(actual.columns) == ["sample", "1st", "2nd", "3rd"]
+    assert (actual["sample"] == df.index).all()
+    p = decomposition.PCA(n_components=3)
+    should = p.fit_transform(df)
+    np.testing.assert_allclose(should, actual[["1st", "2nd", "3rd"]].to_numpy())
+    np.testing.assert_allclose(
+        p.explained_variance_ratio_, actual.explained_variance_ratio_
+    )
+
+
+def test_pca_randomized_and_float32():
+    pytest.importorskip("sklearn")
+    df = mtcars.select_dtypes(np.number)
+    full = dp(df).pca().pd
+    randomized = dp(df).pca(svd_solver="randomized", random_state=5).pd
+    np.testing.assert_allclose(
+        np.abs(full[["1st", "2nd"]].to_numpy()),
+        np.abs(randomized[["1st", "2nd"]].to_numpy()),
+        rtol=1e-4,
+    )
+    actual = dp(df.astype(np.float32)).pca().pd
+    assert (actual[["1st", "2nd"]].dtypes == np.float32).all()
+    np.testing.assert_allclose(
+        np.abs(full[["1st", "2nd"]].to_numpy()),
+        np.abs(actual[["1st", "2nd"]].to_numpy()),
+        rtol=1e-3,
+    )
+
+
+def test_pca_incremental():
+    pytest.importorskip("sklearn")
+    df = mtcars.select_dtypes(np.number)
+    full = dp(df).pca(n_components=2).pd
+    actual = dp(df).pca(n_components=2, batch_size=10).pd
+    assert list(actual.columns) == ["sample", "1st", "2nd"]
+    assert len(actual) == len(df)
+    np.testing.assert_allclose(
+        full.explained_variance_ratio_, actual.explained_variance_ratio_, rtol=1e-2
+    )
+    np.testing.assert_allclose(
+        np.abs(full["1st"].to_numpy()), np.abs(actual["1st"].to_numpy()), rtol=1e-2
+    )
+    with pytest.raises(ValueError):
+        dp(df).pca(batch_size=10, svd_solver="full")